@@ -1,21 +1,66 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-# Import your modules
-from src.data_pipeline import generate_gps_data, generate_rental_history
-from src.demand_model import forecast_demand
-from src.route_vrp import optimize_route
-from src.lifecycle import check_equipment_health
-from src.cctv_data import generate_cctv_data
-from src.shared_pool import generate_shared_pool
-from src.equipment_location import generate_equipment_locations
-from src.sustainability import calculate_sustainability
-from src.circular_economy import circular_recommendation
-from src.demand_model import region_trend
-from src.external_api import get_weather_forecast
-from src.report_generator import generate_report
-from src.kpi import KPIWeights
+
+# Only light modules at the top: the login page must not pay for pandas,
+# plotly, reportlab or OR-Tools. The dashboard imports them on first use.
+from src.instrumentation import get_tracer, size_of
+
+tracer = get_tracer()
+
+
+@tracer.traced("pdf_build")
+def _build_report(kpi_data, sustain_data, circular_data):
+    from src.report_service import default_service
+    return default_service().content(kpi_data, sustain_data, circular_data)
+
+
+@tracer.traced("route_solve", size=lambda f: len(f.results))
+def _route_solve(*args, **kwargs):
+    from src.route_batch import weight_sweep
+    return weight_sweep(*args, **kwargs)
+
+
+_health_scoring = tracer.traced("health_scoring")
+
+
+def _is_admin() -> bool:
+    return st.session_state.get("username") == "admin"
+
+
+def _admin_panel():
+    # Stage timings of recent refreshes; only shown to the admin account.
+    import pandas as pd
+
+    with st.sidebar.expander("🛠️ Performance (admin)"):
+        st.checkbox("Profiling mode", key="profiling",
+                    help="Run each stage of your next refreshes under cProfile (slower)")
+        if tracer.refreshes:
+            last = tracer.refreshes[-1]
+            st.caption(f"Last refresh: {last['seconds']:.3f}s")
+            st.dataframe(pd.DataFrame(last["spans"])[["name", "seconds", "size"]], use_container_width=True)
+        st.dataframe(pd.DataFrame(tracer.summary()), use_container_width=True)
+        recent = (tracer.refreshes[-1]["spans"] if tracer.refreshes else []) + list(tracer.background)[-3:]
+        for span in recent:
+            if span.get("profile"):
+                st.text(f"{span['name']}\n{span['profile']}")
+        n = st.number_input("Refreshes to export", 1, tracer.refreshes.maxlen, 10)
+        st.download_button("Export timings (JSON)", data=tracer.export(int(n)),
+                           file_name="refresh_timings.json", mime="application/json")
+
+
+def _poll_background_jobs(runner):
+    # Re-run the page once the background jobs it is waiting on have finished.
+    @st.fragment(run_every=1.0)
+    def _poll():
+        if not runner.pending():
+            st.rerun()
+    _poll()
+
+def _job_failed(runner, slot, key, what):
+    # A failed job is not resubmitted on rerun; the user decides when to try again.
+    st.error(f"{what} failed: {runner.error(slot, key)}")
+    if st.button("Retry", key=f"retry-{slot}-{key}"):
+        runner.retry(slot, key)
+        st.rerun()
 
 # --- Fake login ---
 def login_page():
@@ -29,12 +74,21 @@ def login_page():
     if st.button("Login"):
         if username == "admin" and password == "1234":
             st.session_state["logged_in"] = True
+            st.session_state["username"] = username
             st.rerun()
         else:
             st.error("Invalid credentials")
 
 # --- Main dashboard ---
 def dashboard():
+    import pandas as pd
+    import plotly.express as px
+
+    from src.data_context import get_context
+    from src.external_api import fleet_weather
+    from src.jobs import get_runner
+    from src.kpi import KPIWeights
+
     st.set_page_config(page_title="RPM Hire AI System", layout="wide")
 
     with st.sidebar:
@@ -85,17 +139,41 @@ def dashboard():
     st.markdown("---")
 
 
-    gps_df = generate_gps_data()
-    demand_forecast = forecast_demand("data/rental_history.csv")
-    route, route_metrics = optimize_route(use_mock=True, weights=kpi_w)
-    lifecycle_status = check_equipment_health()
-    cctv = generate_cctv_data()
-    pool = generate_shared_pool()
-    sustain = calculate_sustainability()
-    circular = circular_recommendation()
+    ctx = get_context()
+    runner = get_runner()
+    tracer.begin_refresh(profile=_is_admin() and st.session_state.get("profiling", False))
+    with tracer.span("load_gps") as rec:
+        gps_df = ctx.gps()
+        rec["size"] = len(gps_df)
+    with tracer.span("forecast") as rec:
+        demand_forecast = ctx.forecast()
+        rec["size"] = len(demand_forecast)
+
+    # Slow work runs on the background runner; the page renders the last-known
+    # result (or a placeholder) and refreshes when the job completes.
+    # The frontier is solved once per server process across a KPI-weight grid,
+    # so slider moves are lookups.
+    frontier, _ = runner.get("route_frontier", "mock-r4", _route_solve, resolution=4, time_limit_s=0.5)
+    with tracer.span("route_lookup"):
+        route, route_metrics = frontier.value.lookup(kpi_w) if frontier else (None, None)
+    # keyed on the GPS file's version, so a changed trace rescores instead of
+    # serving the first result for the life of the process
+    health_key = ("fleet", ctx.version("gps"))
+    health, _ = runner.get("health", health_key, _health_scoring(ctx.health))
+    with tracer.span("load_cctv") as rec:
+        cctv = ctx.cctv()
+        rec["size"] = len(cctv)
+    with tracer.span("load_shared_pool") as rec:
+        pool = ctx.shared_pool()
+        rec["size"] = len(pool)
+    with tracer.span("sustainability"):
+        sustain = ctx.sustainability()
+    with tracer.span("circular") as rec:
+        circular = ctx.circular()
+        rec["size"] = size_of(circular)
 
     # === KPI Summary Cards ===
-    total_demand = demand_forecast["demand_forecast_days"].sum()
+    total_demand = demand_forecast["weather_adjusted_days"].sum()
     total_assets = len(pool)
     co2_saved = sustain.get("CO2_saved", 0)
     healthy_ratio = sustain.get("Healthy_Assets", 0) / total_assets if total_assets else 0
@@ -162,22 +240,27 @@ def dashboard():
             st.dataframe(demand_forecast, use_container_width=True)
         with col2:
             st.subheader("Forecasted Demand (Chart)")
-            fig = px.bar(demand_forecast, x="project", y="demand_forecast_days",
-                         title="Forecasted Rental Demand (Days)", text_auto=True,
-                         color_discrete_sequence=["#0057B8"])
+            fig = px.bar(demand_forecast, x="project", y=["demand_forecast_days", "weather_adjusted_days"],
+                         title="Forecasted Rental Demand (Days), with Weather Adjustment", text_auto=True,
+                         barmode="group", color_discrete_sequence=["#0057B8", "#7FB3E6"])
             st.plotly_chart(fig, use_container_width=True)
 
     # --- Route Optimization ---
     with tab2:
         st.subheader("Optimized Route")
-        st.write("Optimal Route:", " → ".join(route))
+        if route is None and runner.error("route_frontier", "mock-r4") is not None:
+            _job_failed(runner, "route_frontier", "mock-r4", "Route solve")
+        elif route is None:
+            st.info("⏳ Solving routes in the background...")
+        else:
+            st.write("Optimal Route:", " → ".join(route))
 
-        m = route_metrics
-        c1, c2, c3, c4 = st.columns(4)
-        c1.metric("Distance (km)", m["distance_km"])
-        c2.metric("Time (hr)",     m["time_hr"])
-        c3.metric("CO₂ (kg)",      m["co2_kg"])
-        c4.metric("Congestion idx",m["congestion_index"])
+            m = route_metrics
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Distance (km)", m["distance_km"])
+            c2.metric("Time (hr)",     m["time_hr"])
+            c3.metric("CO₂ (kg)",      m["co2_kg"])
+            c4.metric("Congestion idx",m["congestion_index"])
 
         st.caption("Tip: Tip: Adjust the KPI weights on the left to instantly change the route and metrics.")
         st.map(gps_df[["lat", "lon"]], zoom=5)
@@ -187,8 +270,12 @@ def dashboard():
         c1, c2 = st.columns(2)
         with c1:
             st.subheader("Lifecycle Status")
-            lifecycle_df = check_equipment_health()
-            st.dataframe(lifecycle_df, use_container_width=True)
+            if health is None and runner.error("health", health_key) is not None:
+                _job_failed(runner, "health", health_key, "Health scoring")
+            elif health is None:
+                st.info("⏳ Scoring equipment health...")
+            else:
+                st.dataframe(health.value, use_container_width=True)
         with c2:
             st.subheader("CCTV Traffic Data")
 
@@ -266,6 +353,20 @@ def dashboard():
         fig_sustain.update_traces(textposition="outside")
         st.plotly_chart(fig_sustain, use_container_width=True)
 
+        st.subheader("Emissions by Equipment")
+        with tracer.span("emissions") as rec:
+            per_equipment = ctx.emissions().by_equipment()
+            rec["size"] = len(per_equipment)
+        # distance comes from odometer deltas, so a unit needs two pings to show any
+        single = int((per_equipment["pings"] < 2).sum())
+        if single == len(per_equipment):
+            st.info("Per-unit emissions need at least two GPS pings per unit; this trace has one "
+                    "ping per unit, so only the fleet-wide figures above apply.")
+        else:
+            st.dataframe(per_equipment.sort_values("co2_kg", ascending=False).round(2), use_container_width=True)
+            if single:
+                st.caption(f"{single} unit(s) with a single ping show zero distance and emissions.")
+
     # --- Circular Economy ---
     with tab5:
         st.subheader("Shared Equipment Pool (Cross-Company)")
@@ -301,7 +402,9 @@ def dashboard():
     # --- Region Trends ---
     with tab6:
         st.subheader("Historical Rental Trends by Region")
-        region_df = region_trend("data/rental_history.csv")
+        with tracer.span("region_trend") as rec:
+            region_df = ctx.region_trend()
+            rec["size"] = len(region_df)
         st.dataframe(region_df, use_container_width=True)
 
 
@@ -321,7 +424,9 @@ def dashboard():
     # --- Weather Impact ---
     with tab7:
         st.subheader("Weather Forecast Impact on Demand")
-        weather = get_weather_forecast()
+        with tracer.span("weather") as rec:
+            weather = fleet_weather(ctx.weather())
+            rec["size"] = len(weather)
         st.dataframe(weather, use_container_width=True)
 
 
@@ -353,19 +458,23 @@ def dashboard():
 
     # --- Report Download ---
     st.markdown("### 📥 Download Report")
-    pdf_buffer = generate_report(
-        {"Total Demand": total_demand, "Assets": total_assets},
-        sustain,
-        circular
-    )
+    # Rendered only when the button is clicked, and cached on disk by input hash.
+    report_inputs = ({"Total Demand": total_demand, "Assets": total_assets}, sustain, circular)
     st.download_button(
         "Download Sustainability Report",
-        data=pdf_buffer,
+        data=lambda: _build_report(*report_inputs),
         file_name="sustainability_report.pdf",
         mime="application/pdf"
     )
 
 
+    tracer.end_refresh()
+    if _is_admin():
+        _admin_panel()
+
+    if runner.pending():
+        _poll_background_jobs(runner)
+
     # Footer
     st.markdown("---")
     st.markdown(
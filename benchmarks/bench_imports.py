@@ -0,0 +1,95 @@
+# benchmarks/bench_imports.py
+"""
+Cold-start cost of the app login page and the CLI entry points.
+
+Each target runs in a fresh interpreter under `python -X importtime`; the
+report shows wall time, total import time, the heaviest top-level imports and
+which heavy libraries got loaded.
+
+    python -m benchmarks.bench_imports
+    python -m benchmarks.bench_imports --targets login --top 15 --budget 1.0
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("pandas", "numpy", "pyarrow", "plotly.express", "reportlab", "ortools")
+
+# target -> code run in the fresh interpreter; the login page runs app.py in
+# Streamlit's bare mode, which renders the logged-out branch
+TARGETS: Dict[str, str] = {
+    "login": "import logging, runpy; logging.disable(logging.WARNING); runpy.run_path('app.py', run_name='__main__')",
+    "bench_cli": "import benchmarks.run",
+    "report_service": "import src.report_service",
+    "route_cache": "import src.route_cache",
+    "columnar_store": "import src.columnar_store",
+    "data_context": "import src.data_context",
+}
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+{code}
+wall = time.perf_counter() - t0
+print(json.dumps({{"wall_s": wall, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """Rows of `-X importtime` output: module, self_us, cumulative_us, depth (0 = top level)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cum_us), "depth": depth})
+    return rows
+
+
+def profile(code: str) -> dict:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE.format(code=code, heavy=HEAVY)],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = parse_importtime(proc.stderr)
+    top = sorted((r for r in rows if r["depth"] == 0), key=lambda r: r["cumulative_us"], reverse=True)
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "wall_s": round(probe["wall_s"], 3),
+        "import_s": round(sum(r["cumulative_us"] for r in top) / 1e6, 3),
+        "modules": len(rows),
+        "heavy_loaded": probe["loaded"],
+        "top": [(r["module"], round(r["cumulative_us"] / 1e3, 1)) for r in top],
+    }
+
+
+def run(targets: List[str], top: int = 10) -> Dict[str, dict]:
+    results = {}
+    for name in targets:
+        r = profile(TARGETS[name])
+        r["top"] = r["top"][:top]
+        results[name] = r
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument("--top", type=int, default=5, help="heaviest top-level imports to list")
+    parser.add_argument("--budget", type=float, help="fail if the login page takes longer (seconds)")
+    args = parser.parse_args()
+
+    results = run(args.targets, args.top)
+    for name, r in results.items():
+        heavy = ", ".join(r["heavy_loaded"]) or "none"
+        print(f"{name:<16} wall {r['wall_s']:>6.3f}s  imports {r['import_s']:>6.3f}s  "
+              f"{r['modules']:>5} modules  heavy: {heavy}")
+        for module, ms in r["top"]:
+            print(f"    {ms:>9.1f} ms  {module}")
+    login = results.get("login")
+    if args.budget is not None and login is not None and login["wall_s"] > args.budget:
+        print(f"login page over budget: {login['wall_s']:.3f}s > {args.budget:.3f}s")
+        sys.exit(1)
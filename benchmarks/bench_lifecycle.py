@@ -0,0 +1,82 @@
+# benchmarks/bench_lifecycle.py
+"""
+Row-wise df.apply health scoring vs the vectorized score_fleet.
+
+    python -m benchmarks.bench_lifecycle --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.lifecycle import score_fleet
+
+SIZES = (10_000, 100_000, 1_000_000)
+ROWWISE_MAX = 100_000   # the row-wise baseline takes minutes beyond this
+
+
+def _fleet(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "equipment_id": np.arange(n),
+        "usage_hours": rng.integers(100, 4000, n),
+        "move_count": rng.integers(5, 120, n),
+        "mileage_km": rng.integers(200, 20000, n),
+    })
+
+
+def _score_rowwise(df):
+    # mirrors the pre-vectorization implementation of check_equipment_health
+    def _health_score(usage_hours, move_count, mileage_km):
+        score = 100
+        score -= 0.02 * usage_hours
+        score -= 0.5  * move_count
+        score -= 0.01 * mileage_km
+        return float(np.clip(score, 0, 100))
+
+    def _recommend(h):
+        if h > 80:  return "✅ Continue using"
+        if h > 60:  return "🔧 Schedule maintenance"
+        if h > 40:  return "🔧 Refurbish soon"
+        return "♻️ Recycle/Decommission"
+
+    df = df.copy()
+    df["health_score"] = df.apply(
+        lambda r: _health_score(r["usage_hours"], r["move_count"], r["mileage_km"]), axis=1
+    )
+    df["RUL_days"] = df["health_score"].apply(lambda h: int(round((h / 100.0) * 365)))
+    df["recommendation"] = df["health_score"].apply(_recommend)
+    return df
+
+
+def _time(fn, df):
+    t0 = time.perf_counter()
+    out = fn(df)
+    return time.perf_counter() - t0, out
+
+
+def run(sizes=SIZES, rowwise_max=ROWWISE_MAX):
+    results = []
+    for n in sizes:
+        df = _fleet(n)
+        vec_s, vec = _time(score_fleet, df)
+        row = {"n": n, "vectorized_s": round(vec_s, 4), "rowwise_s": None, "speedup": None}
+        if n <= rowwise_max:
+            row_s, ref = _time(_score_rowwise, df)
+            cols = ["health_score", "RUL_days", "recommendation"]
+            assert ref[cols].equals(vec[cols]), "vectorized scores differ from row-wise"
+            row.update(rowwise_s=round(row_s, 4), speedup=round(row_s / vec_s, 1))
+        results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--rowwise-max", type=int, default=ROWWISE_MAX,
+                        help="skip the slow row-wise baseline above this fleet size")
+    args = parser.parse_args()
+
+    for r in run(args.sizes, args.rowwise_max):
+        print(r)
@@ -0,0 +1,89 @@
+# benchmarks/bench_route_solver.py
+"""
+Python transit callback vs precomputed arc-cost matrix in the OR-Tools search.
+
+Both variants get the same time budget, so the difference shows up as how much
+search the solver completes:
+
+    python -m benchmarks.bench_route_solver --sizes 50 200 1000 --seconds 3
+"""
+import argparse
+import time
+
+import numpy as np
+from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
+from src.kpi import KPIWeights, normalize_weights
+from src.route_matrix import RouteMatrix
+from src.route_vrp import _arc_cost_matrix
+
+
+def _random_nodes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-10, 10, (n, 2))
+
+
+def _solve(mat, w, mode, seconds):
+    manager = pywrapcp.RoutingIndexManager(mat.n, 1, 0)
+    routing = pywrapcp.RoutingModel(manager)
+    calls = [0]
+
+    if mode == "callback":
+        # mirrors the pre-matrix implementation of optimize_route
+        dist, time_h, co2, cong = (m.tolist() for m in (mat.dist, mat.time_h, mat.co2, mat.cong))
+
+        def cost_cb(from_index, to_index):
+            calls[0] += 1
+            i, j = manager.IndexToNode(from_index), manager.IndexToNode(to_index)
+            cost = (
+                w.distance * dist[i][j] +
+                w.time     * time_h[i][j] * 10.0 +
+                w.co2      * co2[i][j]    * 0.1 +
+                w.congestion * cong[i][j] * 10.0
+            )
+            return int(round(cost * 1000))
+
+        cb = routing.RegisterTransitCallback(cost_cb)
+    else:
+        cb = routing.RegisterTransitMatrix(_arc_cost_matrix(mat, w).tolist())
+
+    routing.SetArcCostEvaluatorOfAllVehicles(cb)
+    search = pywrapcp.DefaultRoutingSearchParameters()
+    search.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+    search.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    search.time_limit.FromSeconds(seconds)
+
+    t0 = time.perf_counter()
+    solution = routing.SolveWithParameters(search)
+    elapsed = time.perf_counter() - t0
+    solver = routing.solver()
+    return {
+        "mode": mode,
+        "n": mat.n,
+        "seconds": round(elapsed, 3),
+        "objective": solution.ObjectiveValue() if solution else None,
+        "solutions_per_s": round(solver.Solutions() / elapsed, 1),
+        "neighbors_per_s": round(solver.AcceptedNeighbors() / elapsed, 1),
+        "branches_per_s": round(solver.Branches() / elapsed, 1),
+        "py_arc_calls_per_s": round(calls[0] / elapsed, 1) if mode == "callback" else None,
+    }
+
+
+def run(sizes=(50, 200, 1000), seconds=3):
+    w = normalize_weights(KPIWeights())
+    results = []
+    for n in sizes:
+        mat = RouteMatrix(_random_nodes(n))
+        for mode in ("callback", "matrix"):
+            results.append(_solve(mat, w, mode, seconds))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--seconds", type=int, default=3)
+    args = parser.parse_args()
+
+    for r in run(args.sizes, args.seconds):
+        print(r)
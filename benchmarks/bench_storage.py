@@ -0,0 +1,75 @@
+# benchmarks/bench_storage.py
+"""
+CSV vs partitioned Parquet load times for a synthetic GPS log.
+
+    python -m benchmarks.bench_storage --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.columnar_store import convert_csv, equipment_filter, read_dataset
+from src.data_pipeline import GPS_DTYPES
+
+
+def _write_gps_csv(path, rows, assets, seed=0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "equipment_id": rng.integers(1, assets + 1, rows),
+        "lat": rng.uniform(-38, -33, rows),
+        "lon": rng.uniform(144, 151, rows),
+        "mileage_km": np.cumsum(rng.integers(1, 10, rows)),
+        "fuel_L_per_100km": rng.uniform(15, 30, rows),
+    }).to_csv(path, index=False)
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+
+def _time(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return round(time.perf_counter() - t0, 4), len(out)
+
+
+def run(rows=1_000_000, assets=10_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "gps_data.csv")
+        _write_gps_csv(csv_path, rows, assets)
+        t0 = time.perf_counter()
+        store = convert_csv("gps", csv_path=csv_path, root=tmp)
+        convert_s = round(time.perf_counter() - t0, 4)
+
+        ids = list(range(1, 11))
+        cols = ["equipment_id", "mileage_km"]
+        dtypes = {"equipment_id": GPS_DTYPES["equipment_id"], "mileage_km": GPS_DTYPES["mileage_km"]}
+        cases = {
+            "csv_full": lambda: pd.read_csv(csv_path),
+            "csv_2_columns": lambda: pd.read_csv(csv_path, usecols=cols, dtype=dtypes),
+            "csv_10_assets": lambda: (lambda d: d[d["equipment_id"].isin(ids)])(
+                pd.read_csv(csv_path, usecols=cols, dtype=dtypes)),
+            "parquet_full": lambda: read_dataset(store),
+            "parquet_2_columns": lambda: read_dataset(store, columns=cols),
+            "parquet_10_assets": lambda: read_dataset(store, columns=cols, filters=equipment_filter(ids)),
+        }
+        results = {"rows": rows, "csv_bytes": os.path.getsize(csv_path),
+                   "parquet_bytes": _dir_size(store), "convert_s": convert_s}
+        for name, fn in cases.items():
+            seconds, n = _time(fn)
+            results[name] = {"seconds": seconds, "rows_out": n}
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--assets", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for k, v in run(args.rows, args.assets).items():
+        print(f"{k}: {v}")
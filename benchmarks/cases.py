@@ -0,0 +1,139 @@
+# benchmarks/cases.py
+"""Benchmark cases per src module, built on the synthetic fleet at each scale."""
+import os
+from functools import cached_property
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import Case
+from src.circular_economy import decide
+from src.demand_model import forecast_demand, region_trend
+from src.emissions import EmissionsEngine
+from src.lifecycle import check_equipment_health, score_fleet
+from src.report_generator import generate_report
+from src.route_vrp import optimize_route
+from src.sustainability import calculate_sustainability
+from src.synthetic import FILENAMES, SCALES, FleetGenerator
+
+ROUTE_NODES = {"small": 20, "medium": 100, "large": 300}
+REPORT_ITEMS = {"small": 100, "medium": 1_000, "large": 10_000}
+
+
+def generator_cases(size: str) -> List[Case]:
+    gen, s = FleetGenerator(), SCALES[size]
+    return [
+        Case("gen_gps", size, s["gps"], "rows", lambda: gen.gps(s["gps"], s["assets"])),
+        Case("gen_rentals", size, s["rentals"], "rows", lambda: gen.rentals(s["rentals"], s["assets"])),
+        Case("gen_cctv", size, s["cctv"], "rows", lambda: gen.cctv(s["cctv"])),
+        Case("gen_pool", size, s["pool"], "rows", lambda: gen.pool(s["pool"])),
+    ]
+
+
+class _Fixtures:
+    """Inputs for one size, each generated (and written) on first use only."""
+
+    def __init__(self, size: str, workdir: str):
+        self.size, self.s = size, SCALES[size]
+        self.dir = os.path.join(workdir, size)
+        os.makedirs(self.dir, exist_ok=True)
+
+    def _write(self, name: str, df: pd.DataFrame) -> str:
+        path = os.path.join(self.dir, FILENAMES[name])
+        df.to_csv(path, index=False)
+        return path
+
+    @cached_property
+    def gps(self) -> pd.DataFrame:
+        return FleetGenerator().gps(self.s["gps"], self.s["assets"])
+
+    @cached_property
+    def gps_path(self) -> str:
+        return self._write("gps", self.gps)
+
+    @cached_property
+    def rentals_path(self) -> str:
+        return self._write("rentals", FleetGenerator().rentals(self.s["rentals"], self.s["assets"]))
+
+    @cached_property
+    def usage_path(self) -> str:
+        rng = np.random.default_rng(0)
+        path = os.path.join(self.dir, "usage.csv")
+        self.gps[["equipment_id"]].drop_duplicates().assign(
+            usage_hours=lambda d: rng.integers(100, 4000, len(d)),
+            move_count=lambda d: rng.integers(5, 120, len(d)),
+        ).to_csv(path, index=False)
+        return path
+
+    @cached_property
+    def fleet(self) -> pd.DataFrame:
+        rng = np.random.default_rng(1)
+        ids = np.arange(1, self.s["assets"] + 1)
+        return score_fleet(pd.DataFrame({
+            "equipment_id": ids,
+            "usage_hours": rng.integers(100, 4000, len(ids)),
+            "move_count": rng.integers(5, 120, len(ids)),
+            "mileage_km": rng.integers(200, 20000, len(ids)),
+        }))
+
+    @cached_property
+    def coords(self) -> List[Tuple[float, float]]:
+        rng = np.random.default_rng(2)
+        return [(float(a), float(b)) for a, b in rng.uniform(-10, 10, (ROUTE_NODES[self.size], 2))]
+
+    @cached_property
+    def circular(self) -> List[dict]:
+        return [{"equipment_id": f"EQT{i}", "recommendation": "✅ Continue using", "health_score": 90}
+                for i in range(REPORT_ITEMS[self.size])]
+
+
+def _module_factories(size: str, fx: _Fixtures) -> Dict[str, Callable[[], Case]]:
+    # each factory touches only the fixtures its case needs, before the case is timed
+    s = SCALES[size]
+
+    def route():
+        coords = fx.coords
+        return Case("optimize_route", size, len(coords), "nodes",
+                    lambda: optimize_route(use_mock=False, coords=coords, metric="euclidean",
+                                           time_limit_s=30, solution_limit=100))
+
+    def health():
+        usage_path, gps_path = fx.usage_path, fx.gps_path
+        return Case("check_equipment_health", size, s["assets"], "assets",
+                    lambda: check_equipment_health(usage_path, gps=gps_path))
+
+    def circular():
+        fleet = fx.fleet
+        return Case("circular_decisions", size, len(fleet), "assets", lambda: decide(fleet))
+
+    def demand():
+        path = fx.rentals_path
+        return Case("forecast_demand", size, s["rentals"], "rows", lambda: forecast_demand(path))
+
+    def trend():
+        path = fx.rentals_path
+        return Case("region_trend", size, s["rentals"], "rows", lambda: region_trend(path))
+
+    def sustainability():
+        path = fx.gps_path
+        return Case("calculate_sustainability", size, s["gps"], "rows", lambda: calculate_sustainability(path))
+
+    def emissions():
+        gps = fx.gps
+        return Case("emissions_engine", size, s["gps"], "rows", lambda: EmissionsEngine().update(gps))
+
+    def report():
+        items = fx.circular
+        return Case("generate_report", size, len(items), "items",
+                    lambda: generate_report({"Total Demand": 1, "Assets": 1}, {"distance_km": 1}, items))
+
+    return {"optimize_route": route, "check_equipment_health": health, "circular_decisions": circular,
+            "forecast_demand": demand, "region_trend": trend, "calculate_sustainability": sustainability,
+            "emissions_engine": emissions, "generate_report": report}
+
+
+def module_cases(size: str, workdir: str, only: Optional[Iterable[str]] = None) -> List[Case]:
+    """Cases per src module; with `only`, fixtures of the other cases are never generated."""
+    factories = _module_factories(size, _Fixtures(size, workdir))
+    return [make() for name, make in factories.items() if not only or name in only]
@@ -0,0 +1,103 @@
+# benchmarks/harness.py
+import datetime as dt
+import gc
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class Case:
+    name: str
+    size: str
+    items: int                  # rows / nodes / assets processed, for throughput
+    unit: str
+    run: Callable[[], object]
+
+
+@dataclass
+class Result:
+    case: str
+    size: str
+    items: int
+    unit: str
+    seconds: float
+    peak_mb: float
+    throughput: float           # items per second
+
+
+def measure(case: Case, repeat: int = 3) -> Result:
+    """Best-of-`repeat` wall time, then one extra run under tracemalloc for peak memory."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        case.run()
+        best = min(best, time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(case.name, case.size, case.items, case.unit,
+                  round(best, 5), round(peak / 2**20, 2), round(case.items / best, 1) if best else 0.0)
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(results: List[Result], path: str):
+    doc = {
+        "meta": {
+            "created": dt.datetime.now().isoformat(timespec="seconds"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+        },
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2)
+
+
+def load(path: str) -> Dict[tuple, dict]:
+    with open(path) as f:
+        doc = json.load(f)
+    return {(r["case"], r["size"]): r for r in doc["results"]}
+
+
+def compare(base_path: str, new_path: str, threshold: float = 0.2) -> List[dict]:
+    """
+    Per (case, size) present in both files: time and memory ratios new/base.
+    A row is a regression when either ratio exceeds 1 + threshold. Cases in
+    only one file come back as rows with `missing` naming the other file.
+    """
+    base, new = load(base_path), load(new_path)
+    rows = []
+    for key in sorted(base.keys() ^ new.keys()):
+        rows.append({"case": key[0], "size": key[1], "missing": "new" if key in base else "base",
+                     "regression": False})
+    for key in sorted(base.keys() & new.keys()):
+        b, n = base[key], new[key]
+        time_ratio = n["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+        mem_ratio = n["peak_mb"] / b["peak_mb"] if b["peak_mb"] else 1.0
+        rows.append({
+            "case": key[0], "size": key[1],
+            "base_s": b["seconds"], "new_s": n["seconds"], "time_ratio": round(time_ratio, 3),
+            "base_mb": b["peak_mb"], "new_mb": n["peak_mb"], "mem_ratio": round(mem_ratio, 3),
+            "regression": time_ratio > 1 + threshold or mem_ratio > 1 + threshold,
+        })
+    return rows
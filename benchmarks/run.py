@@ -0,0 +1,61 @@
+# benchmarks/run.py
+"""
+Benchmark suite over every src hot path.
+
+    python -m benchmarks.run --sizes small medium --out bench_results.json
+    python -m benchmarks.run compare base.json new.json --threshold 0.2
+"""
+import argparse
+import sys
+import tempfile
+
+from benchmarks.harness import compare, measure, save
+
+
+def run(sizes, only=None, repeat=3):
+    # the cases pull in every src module; `compare` does not need them
+    from benchmarks.cases import generator_cases, module_cases
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            for case in generator_cases(size) + module_cases(size, workdir, only):
+                if only and case.name not in only:
+                    continue
+                r = measure(case, repeat)
+                print(f"{r.case:<26} {r.size:<7} {r.seconds:>9.4f}s {r.peak_mb:>9.1f} MB "
+                      f"{r.throughput:>14,.0f} {r.unit}/s", flush=True)
+                results.append(r)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite")
+    sub = parser.add_subparsers(dest="cmd")
+    cmp_ = sub.add_parser("compare", help="flag regressions between two result files")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown / memory growth (0.2 = 20%%)")
+    parser.add_argument("--sizes", nargs="+", default=["small"], choices=["small", "medium", "large"])
+    parser.add_argument("--only", nargs="*", help="case names to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "compare":
+        rows = compare(args.base, args.new, args.threshold)
+        for r in rows:
+            if r.get("missing"):
+                print(f"{r['case']:<26} {r['size']:<7} missing from {r['missing']}")
+                continue
+            flag = "REGRESSION" if r["regression"] else "ok"
+            print(f"{r['case']:<26} {r['size']:<7} time x{r['time_ratio']:<6} mem x{r['mem_ratio']:<6} {flag}")
+        return 1 if any(r["regression"] for r in rows) else 0
+
+    save(run(args.sizes, args.only, args.repeat), args.out)
+    print(f"results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# src/asset_registry.py
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.lifecycle import HealthCoefficients, health_scores, recommend
+
+ID_PREFIX = "EQT"
+
+
+def normalize_ids(ids) -> np.ndarray:
+    """
+    Canonical integer equipment ids: 7, "7", "EQT7" and "EQT007" all become 7.
+    Raises ValueError for ids that are neither integers nor EQT-numbered strings.
+    """
+    s = pd.Series(ids)
+    if pd.api.types.is_integer_dtype(s):
+        return s.to_numpy(dtype=np.int64)
+    digits = s.astype(str).str.extract(rf"^\s*(?:{ID_PREFIX})?0*(\d+)\s*$", flags=re.IGNORECASE)[0]
+    if digits.isna().any():
+        bad = s[digits.isna()].head(3).tolist()
+        raise ValueError(f"Unrecognised equipment id(s) {bad}; expected integers or {ID_PREFIX}-numbered strings")
+    return digits.astype(np.int64).to_numpy()
+
+
+def format_ids(ids, width: int = 3) -> np.ndarray:
+    """Canonical ids back to display form: 7 -> "EQT007"."""
+    return (pd.Series(np.asarray(ids)).astype(str).str.zfill(width).radd(ID_PREFIX)).to_numpy(dtype=object)
+
+
+# column -> dtype; str columns are stored as int32 codes into a per-column category list
+NUMERIC = {
+    "lat": np.float64, "lon": np.float64,
+    "mileage_km": np.float64, "usage_hours": np.float64, "move_count": np.int64,
+    "health_score": np.float32, "RUL_days": np.int32,
+    "distance_km": np.float64, "fuel_L": np.float64, "co2_kg": np.float64,
+}
+CATEGORICAL = ("equipment_type", "company", "status", "location")
+DENSE_FACTOR = 4    # direct-address id table only while max id < DENSE_FACTOR * assets
+_MISSING = {np.dtype(np.float64): np.nan, np.dtype(np.float32): np.nan}
+
+
+class AssetRegistry:
+    """
+    One row per physical asset, shared by lifecycle, sustainability and pool code.
+
+    Equipment ids from any source (ints in the GPS trace, "EQT001" strings in
+    the pool) are normalized and interned to dense row indices through a
+    direct-address table, so lookups are a single array index. When ids are
+    too sparse for that (the table would outgrow DENSE_FACTOR x the asset
+    count), a pandas hash index takes over. Attributes are typed column
+    arrays (categories as int32 codes); `column` hands out read-only views
+    over them rather than copies, and updates are vectorized scatters by row.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._n = 0
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._index: Optional[np.ndarray] = np.full(capacity, -1, dtype=np.int64)  # canonical id -> row
+        self._sparse: Optional[pd.Index] = None   # used instead once ids are too sparse for the table
+        self._num: Dict[str, np.ndarray] = {
+            name: np.full(capacity, _MISSING.get(np.dtype(dt), 0), dtype=dt) for name, dt in NUMERIC.items()}
+        self._codes: Dict[str, np.ndarray] = {name: np.full(capacity, -1, dtype=np.int32) for name in CATEGORICAL}
+        self._categories: Dict[str, List[str]] = {name: [] for name in CATEGORICAL}
+        self._category_of: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL}
+
+    def __len__(self):
+        return self._n
+
+    # --- interning ---
+    def _grow_rows(self, needed: int):
+        cap = len(self._ids)
+        if needed <= cap:
+            return
+        new_cap = max(needed, cap * 2)
+        self._ids = np.resize(self._ids, new_cap)
+        for store in (self._num, self._codes):
+            for name, old in store.items():
+                arr = np.full(new_cap, _MISSING.get(old.dtype, -1 if store is self._codes else 0), dtype=old.dtype)
+                arr[:cap] = old
+                store[name] = arr
+
+    def _dense_ok(self, max_id: int, n: int) -> bool:
+        # the direct-address table stays within a few times the asset count;
+        # sparse id spaces (e.g. IMEI-style tracker ids) use a hash index instead
+        return max_id < max(DENSE_FACTOR * n, 1024)
+
+    def _grow_index(self, max_id: int):
+        if max_id < len(self._index):
+            return
+        index = np.full(max(max_id + 1, len(self._index) * 2), -1, dtype=np.int64)
+        index[:len(self._index)] = self._index
+        self._index = index
+
+    def _lookup(self, keys: np.ndarray) -> np.ndarray:
+        if self._index is None:
+            if self._sparse is None:
+                self._sparse = pd.Index(self._ids[:self._n])
+            return self._sparse.get_indexer(keys).astype(np.int64)
+        out = np.full(len(keys), -1, dtype=np.int64)
+        inside = (keys >= 0) & (keys < len(self._index))
+        out[inside] = self._index[keys[inside]]
+        return out
+
+    def index_of(self, ids) -> np.ndarray:
+        """Row of each id, -1 where unknown."""
+        return self._lookup(normalize_ids(ids))
+
+    def intern(self, ids) -> np.ndarray:
+        """Row of each id, adding rows for ids not seen before."""
+        keys = normalize_ids(ids)
+        if len(keys) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if keys.min() < 0:
+            raise ValueError("equipment ids must be non-negative")
+        new = np.unique(keys[self._lookup(keys) < 0])
+        if len(new):
+            start, end = self._n, self._n + len(new)
+            self._grow_rows(end)
+            self._ids[start:end] = new
+            self._n = end
+            self._sparse = None
+            if self._index is not None and self._dense_ok(int(new[-1]), end):
+                self._grow_index(int(new[-1]))
+                self._index[new] = np.arange(start, end)
+            else:
+                self._index = None
+        return self._lookup(keys)
+
+    def _encode(self, name: str, values) -> np.ndarray:
+        codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+        lookup = self._category_of[name]
+        for value in uniques:
+            if value not in lookup:
+                lookup[value] = len(self._categories[name])
+                self._categories[name].append(value)
+        table = np.array([lookup[v] for v in uniques] + [-1], dtype=np.int32)
+        return table[codes]                      # code -1 (missing) maps to the trailing -1
+
+    # --- updates ---
+    def set(self, ids, **columns) -> np.ndarray:
+        """Set attribute columns for these ids (added if new); returns their rows."""
+        rows = self.intern(ids)
+        for name, values in columns.items():
+            if name in self._codes:
+                self._codes[name][rows] = self._encode(name, values)
+            elif name in self._num:
+                self._num[name][rows] = np.asarray(values, dtype=self._num[name].dtype)
+            else:
+                raise KeyError(f"Unknown asset column {name!r}")
+        return rows
+
+    def ingest_usage(self, usage: pd.DataFrame):
+        """Usage totals: equipment_id, usage_hours, move_count."""
+        self.set(usage["equipment_id"], usage_hours=usage["usage_hours"], move_count=usage["move_count"])
+
+    def ingest_gps(self, pings: pd.DataFrame):
+        """GPS pings in time order: keeps the highest odometer and the latest position per asset."""
+        rows = self.intern(pings["equipment_id"])
+        km = self._num["mileage_km"]
+        latest = np.full(self._n, -np.inf)
+        np.maximum.at(latest, rows, pings["mileage_km"].to_numpy(dtype=float))
+        touched = np.unique(rows)
+        km[touched] = np.fmax(km[touched], latest[touched])
+        if {"lat", "lon"} <= set(pings.columns):
+            self._num["lat"][rows] = pings["lat"].to_numpy(dtype=float)   # last write wins
+            self._num["lon"][rows] = pings["lon"].to_numpy(dtype=float)
+
+    def ingest_pool(self, pool: pd.DataFrame):
+        """Shared-pool rows: equipment_id, company, equipment_type, status."""
+        cols = {c: pool[c] for c in ("company", "equipment_type", "status", "location") if c in pool.columns}
+        self.set(pool["equipment_id"], **cols)
+
+    def ingest_emissions(self, per_equipment: pd.DataFrame):
+        """Per-equipment totals from src.emissions (distance_km, fuel_L, co2_kg)."""
+        self.set(per_equipment["equipment_id"], distance_km=per_equipment["distance_km"],
+                 fuel_L=per_equipment["fuel_L"], co2_kg=per_equipment["co2_kg"])
+
+    def score_health(self, coeffs: Optional[HealthCoefficients] = None):
+        """Recompute health_score / RUL_days for every asset with usage, in place."""
+        coeffs = coeffs or HealthCoefficients()
+        n = self._n
+        usage = self.column("usage_hours")
+        moves = self.column("move_count")
+        km = self.column("mileage_km")
+        known = ~np.isnan(usage)
+        fill_km = np.nanmedian(km[known]) if np.any(known & ~np.isnan(km)) else 0.0
+        score, rul = health_scores(usage[known], moves[known], np.where(np.isnan(km[known]), fill_km, km[known]), coeffs)
+        self._num["health_score"][:n][known] = score
+        self._num["RUL_days"][:n][known] = rul
+
+    # --- views ---
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of a numeric column, or the codes of a categorical one."""
+        arr = (self._num.get(name) if name in self._num else self._codes[name])[:self._n]
+        view = arr.view()
+        view.setflags(write=False)
+        return view
+
+    def categories(self, name: str) -> List[str]:
+        return list(self._categories[name])
+
+    def labels(self, name: str) -> np.ndarray:
+        """Decoded values of a categorical column (None where unset)."""
+        table = np.array(self._categories[name] + [None], dtype=object)
+        return table[self.column(name)]
+
+    def ids(self) -> np.ndarray:
+        view = self._ids[:self._n].view()
+        view.setflags(write=False)
+        return view
+
+    def rows(self, **where) -> np.ndarray:
+        """Rows whose categorical columns equal the given values, e.g. rows(status="Available")."""
+        mask = np.ones(self._n, dtype=bool)
+        for name, value in where.items():
+            code = self._category_of[name].get(value, -2)
+            mask &= self.column(name) == code
+        return np.flatnonzero(mask)
+
+    def frame(self, columns: Optional[Iterable[str]] = None, rows=None, display_ids: bool = False) -> pd.DataFrame:
+        columns = list(columns) if columns is not None else list(CATEGORICAL) + list(NUMERIC)
+        sel = slice(None) if rows is None else rows
+        ids = self.ids()[sel]
+        data = {"equipment_id": format_ids(ids) if display_ids else ids}
+        for name in columns:
+            data[name] = self.labels(name)[sel] if name in self._codes else self.column(name)[sel]
+        return pd.DataFrame(data)
+
+    def health_frame(self) -> pd.DataFrame:
+        """check_equipment_health-shaped frame for every asset with usage."""
+        known = np.flatnonzero(~np.isnan(self.column("usage_hours")))
+        df = self.frame(["usage_hours", "move_count", "mileage_km", "health_score", "RUL_days"], known, display_ids=True)
+        df["recommendation"] = recommend(df["health_score"].to_numpy())
+        return df
+
+    def pool_frame(self) -> pd.DataFrame:
+        """Pool assets in the generate_shared_pool schema, ready for PoolAllocator."""
+        rows = np.flatnonzero(self.column("company") >= 0)
+        df = self.frame(["company", "equipment_type", "status", "lat", "lon"], rows, display_ids=True)
+        return df if df[["lat", "lon"]].notna().all().all() else df.drop(columns=["lat", "lon"])
+
+    def nbytes(self) -> int:
+        n = self._n
+        return (self._ids[:n].nbytes + sum(a[:n].nbytes for a in self._num.values())
+                + sum(a[:n].nbytes for a in self._codes.values()))
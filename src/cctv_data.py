@@ -1,17 +1,21 @@
 # src/cctv_data.py
+import numpy as np
 import pandas as pd
-import random
 
-def generate_cctv_data(n=50):
-    vehicle_types = ["Car", "Truck", "Bus", "Motorbike"]
-    rows = []
-    for _ in range(n):
-        rows.append({
-            "vehicle_type": random.choice(vehicle_types),
-            "vehicle_flow": random.randint(20, 200),
-            "pedestrian_flow": random.randint(5, 50)
-        })
-    return pd.DataFrame(rows)
+VEHICLE_TYPES = ["Car", "Truck", "Bus", "Motorbike"]
+LOCATIONS = ["SiteA", "SiteB", "SiteC"]
+
+def generate_cctv_data(n=50, seed=7, path=None):
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "location": rng.choice(LOCATIONS, n),
+        "vehicle_type": rng.choice(VEHICLE_TYPES, n),
+        "vehicle_flow": rng.integers(20, 201, n),
+        "pedestrian_flow": rng.integers(5, 51, n)
+    })
+    if path:
+        df.to_csv(path, index=False)
+    return df
 
 if __name__ == "__main__":
     print(generate_cctv_data().head())
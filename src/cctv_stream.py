@@ -0,0 +1,262 @@
+# src/cctv_stream.py
+"""
+Live CCTV counts -> windowed per-location flow -> route congestion.
+
+Events are rows of location, vehicle_flow, pedestrian_flow and optionally
+timestamp (arrival time otherwise). They come from a growing CSV (CsvTail) or
+JSON datagrams on a local UDP port (UdpSource) standing in for the camera feed:
+
+    window = FlowWindow()
+    feed = CongestionFeed(window, node_of={"SiteA": 1, "SiteB": 2})
+    source = CsvTail("data/cctv_live.csv")
+    window.add(source.read())
+    matrix = feed.apply(matrix)        # only the changed nodes' arcs are rewritten
+"""
+import io
+import json
+import math
+import os
+import socket
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.route_matrix import RouteMatrix
+
+REQUIRED = ("location", "vehicle_flow")
+
+
+def _valid_events(events: pd.DataFrame):
+    """(events with a location and a numeric vehicle_flow, how many rows were rejected)."""
+    if len(events) == 0:
+        return events, 0
+    if not set(REQUIRED) <= set(events.columns):
+        return events.iloc[:0], len(events)
+    events = events.assign(vehicle_flow=pd.to_numeric(events["vehicle_flow"], errors="coerce"))
+    ok = events["location"].notna() & events["vehicle_flow"].notna()
+    return events[ok], int((~ok).sum())
+
+
+class FlowWindow:
+    """
+    Sliding-window vehicle / pedestrian totals per location in fixed memory.
+
+    Each location owns a ring of `window_s / bucket_s` time buckets; a bucket is
+    cleared when the ring wraps onto a newer time, so memory depends only on the
+    number of locations, never on how many events arrived. Events older than the
+    window (relative to the newest one seen) are dropped.
+    """
+
+    def __init__(self, window_s: int = 900, bucket_s: int = 60, capacity: int = 16):
+        self.window_s = window_s
+        self.bucket_s = bucket_s
+        self.n_buckets = max(1, math.ceil(window_s / bucket_s))
+        self.latest = -1                   # newest bucket number seen
+        self.events = 0
+        self._row: Dict[object, int] = {}
+        self._epoch = np.full((capacity, self.n_buckets), -1, dtype=np.int64)
+        self._vehicles = np.zeros((capacity, self.n_buckets))
+        self._pedestrians = np.zeros((capacity, self.n_buckets))
+        self._observations = np.zeros((capacity, self.n_buckets), dtype=np.int64)
+
+    @property
+    def locations(self):
+        return list(self._row)
+
+    def _rows_for(self, locations: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(locations)
+        for loc in uniques:
+            if loc not in self._row:
+                self._row[loc] = len(self._row)
+        cap = len(self._epoch)
+        if len(self._row) > cap:
+            new_cap = max(len(self._row), cap * 2)
+            for name, fill in (("_epoch", -1), ("_vehicles", 0), ("_pedestrians", 0), ("_observations", 0)):
+                old = getattr(self, name)
+                arr = np.full((new_cap, self.n_buckets), fill, dtype=old.dtype)
+                arr[:cap] = old
+                setattr(self, name, arr)
+        lookup = np.fromiter((self._row[loc] for loc in uniques), dtype=np.int64, count=len(uniques))
+        return np.append(lookup, -1)[codes]      # a missing location (code -1) maps to -1
+
+    def add(self, events: pd.DataFrame, now: Optional[float] = None) -> int:
+        """Fold new events in; returns how many fell inside the window."""
+        if len(events) == 0:
+            return 0
+        if "timestamp" in events.columns:
+            ts = pd.to_datetime(events["timestamp"]).to_numpy(dtype="datetime64[s]").astype(np.int64)
+        else:
+            ts = np.full(len(events), int(now if now is not None else time.time()), dtype=np.int64)
+        bucket = ts // self.bucket_s
+        self.latest = max(self.latest, int(bucket.max()))
+        keep = bucket > self.latest - self.n_buckets
+        if not keep.any():
+            return 0
+        events, bucket = events[keep], bucket[keep]
+
+        rows = self._rows_for(events["location"])
+        if (rows < 0).any():
+            known = rows >= 0
+            events, bucket, rows = events[known], bucket[known], rows[known]
+        slots = bucket % self.n_buckets
+        stale = self._epoch[rows, slots] < bucket
+        self._vehicles[rows[stale], slots[stale]] = 0
+        self._pedestrians[rows[stale], slots[stale]] = 0
+        self._observations[rows[stale], slots[stale]] = 0
+        np.maximum.at(self._epoch, (rows, slots), bucket)
+
+        np.add.at(self._vehicles, (rows, slots), events["vehicle_flow"].to_numpy(dtype=float))
+        if "pedestrian_flow" in events.columns:
+            np.add.at(self._pedestrians, (rows, slots), events["pedestrian_flow"].to_numpy(dtype=float))
+        np.add.at(self._observations, (rows, slots), 1)
+        self.events += len(events)
+        return len(events)
+
+    def totals(self) -> pd.DataFrame:
+        """Per-location flow over the current window, plus vehicles per hour."""
+        n = len(self._row)
+        live = self._epoch[:n] > self.latest - self.n_buckets
+        vehicles = np.where(live, self._vehicles[:n], 0).sum(axis=1)
+        return pd.DataFrame({
+            "location": self.locations,
+            "vehicle_flow": vehicles,
+            "pedestrian_flow": np.where(live, self._pedestrians[:n], 0).sum(axis=1),
+            "observations": np.where(live, self._observations[:n], 0).sum(axis=1),
+            "vehicles_per_hour": vehicles * 3600 / self.window_s,
+        })
+
+
+class CongestionFeed:
+    """
+    Turns windowed flow into per-node congestion levels (0~1) for the route matrix.
+
+    A location's level is its vehicles per hour over `saturation_vph`. `apply`
+    only rewrites the arcs of nodes whose level moved by more than `tolerance`
+    since they were last applied to that matrix. Applied levels are tracked
+    per matrix (weakly), so a freshly built or re-cached matrix gets the full
+    current map.
+    """
+
+    def __init__(self, window: FlowWindow, node_of: Dict[str, int],
+                 saturation_vph: float = 2000.0, tolerance: float = 0.01):
+        self.window = window
+        self.node_of = dict(node_of)
+        self.saturation_vph = saturation_vph
+        self.tolerance = tolerance
+        self._applied: "weakref.WeakKeyDictionary[RouteMatrix, Dict[int, float]]" = weakref.WeakKeyDictionary()
+
+    def levels(self) -> Dict[int, float]:
+        flow = self.window.totals()
+        flow = flow[flow["location"].isin(self.node_of)]
+        level = np.clip(flow["vehicles_per_hour"].to_numpy() / self.saturation_vph, 0, 1.0)
+        return {self.node_of[loc]: float(v) for loc, v in zip(flow["location"], level)}
+
+    def changes(self, matrix: Optional[RouteMatrix] = None) -> Dict[int, float]:
+        """Levels that differ from what `matrix` already carries (all of them for a new matrix)."""
+        applied = self._applied.get(matrix, {}) if matrix is not None else {}
+        return {node: v for node, v in self.levels().items()
+                if abs(applied.get(node, -1.0) - v) > self.tolerance}
+
+    def apply(self, matrix: RouteMatrix) -> RouteMatrix:
+        changed = self.changes(matrix)
+        if not changed:
+            return matrix
+        out = matrix.with_node_congestion(changed)
+        self._applied[out] = {**self._applied.get(matrix, {}), **changed}
+        return out
+
+
+class CsvTail:
+    """
+    Reads only the rows appended to a CSV since the last `read` (restarts if the
+    file shrinks). Rows without a location or a numeric vehicle_flow are counted
+    in `dropped` and skipped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self.header: Optional[str] = None
+        self.dropped = 0
+
+    def read(self) -> pd.DataFrame:
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < self.offset:
+                self.offset, self.header = 0, None        # truncated or rotated
+            f.seek(self.offset)
+            data = f.read()
+        if self.header is None:
+            if b"\n" not in data:
+                return pd.DataFrame()
+            head, data = data.split(b"\n", 1)
+            self.header = head.decode()
+            self.offset += len(head) + 1
+        complete = data[:data.rfind(b"\n") + 1]           # leave a half-written last line for later
+        self.offset += len(complete)
+        if not complete.strip():
+            return pd.DataFrame(columns=self.header.split(","))
+        events, bad = _valid_events(pd.read_csv(io.StringIO(self.header + "\n" + complete.decode())))
+        self.dropped += bad
+        return events
+
+
+class UdpSource:
+    """
+    Local UDP listener standing in for the camera network: each datagram is one
+    JSON event or a list of them. `read` drains whatever has arrived without blocking;
+    datagrams that are not valid JSON, and events without a location or a numeric
+    vehicle_flow, are counted in `dropped` and skipped.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.dropped = 0
+
+    def read(self, max_datagrams: int = 10_000) -> pd.DataFrame:
+        events = []
+        for _ in range(max_datagrams):
+            try:
+                payload = self.sock.recv(65_535)
+            except BlockingIOError:
+                break
+            try:
+                item = json.loads(payload)
+            except ValueError:            # includes UnicodeDecodeError
+                self.dropped += 1
+                continue
+            if not isinstance(item, (dict, list)):
+                self.dropped += 1
+                continue
+            items = item if isinstance(item, list) else [item]
+            events.extend(e for e in items if isinstance(e, dict))
+            self.dropped += sum(not isinstance(e, dict) for e in items)
+        events, bad = _valid_events(pd.DataFrame(events))
+        self.dropped += bad
+        return events
+
+    def close(self):
+        self.sock.close()
+
+
+def run_feed(source, window: FlowWindow, stop: threading.Event, poll_s: float = 1.0):
+    """
+    Poll `source` into `window` until `stop` is set (run it on a background thread).
+    A batch the window cannot take (e.g. unparseable timestamps) is counted in the
+    source's `dropped` and skipped, so one bad event never stops the feed.
+    """
+    while not stop.is_set():
+        batch = source.read()
+        try:
+            window.add(batch)
+        except (KeyError, TypeError, ValueError):
+            source.dropped = getattr(source, "dropped", 0) + len(batch)
+        stop.wait(poll_s)
@@ -1,18 +1,119 @@
 # src/circular_economy.py
-import random
-
-def circular_recommendation(n=5):
-    recs = []
-    for i in range(n):
-        health_score = random.randint(40, 100)
-        if health_score > 80:
-            action = "✅ Continue using"
-        elif health_score > 60:
-            action = "🔧 Refurbish/Maintain"
-        else:
-            action = "♻️ Recycle/Decommission"
-        recs.append({"equipment_id": f"EQT{i+1}", "health_score": health_score, "recommendation": action})
-    return recs
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.lifecycle import DEFAULT_RECOMMENDATION, RECOMMENDATION_BANDS, HealthCoefficients, recommend
+
+# the lowest lifecycle band and the fall-through are the worn-out assets this module acts on
+REFURBISH = RECOMMENDATION_BANDS[-1][1]
+RECYCLE = DEFAULT_RECOMMENDATION
+REDEPLOY = "🚚 Redeploy"
+
+
+@dataclass
+class CircularFactors:
+    day_value_AUD: float = 120.0          # hire margin per day of remaining useful life
+    refurbish_cost_AUD: float = 4000.0    # fixed part of a refurbishment
+    refurbish_cost_per_point_AUD: float = 400.0  # plus this per health point restored
+    refurbish_to_score: float = 85.0      # health score after a refurbishment
+    refurbish_co2_share: float = 0.15     # refurbishment footprint, as a share of a new unit's
+    salvage_AUD: float = 6000.0           # recycling proceeds
+    recycle_co2_credit: float = 0.3       # share of embodied CO2 recovered from recycled material
+    embodied_co2_kg: float = 30000.0      # building one replacement unit
+    redeploy_cost_AUD: float = 1500.0     # transport to a busier depot
+    underused_quantile: float = 0.25      # usage below this fleet quantile counts as idle
+    carbon_price_AUD_per_t: float = 50.0  # puts CO2 and money on one scale
+
+
+def decide(health: pd.DataFrame, factors: Optional[CircularFactors] = None,
+           coeffs: Optional[HealthCoefficients] = None) -> pd.DataFrame:
+    """
+    One action per asset from the lifecycle health frame (equipment_id,
+    health_score, RUL_days, optionally usage_hours), in whole-column operations.
+
+    The lifecycle band is the starting point. Healthy but idle units are
+    redeployed when the extra hire days beat the move. Units in the refurbish
+    and recycle bands get whichever of the two has the higher net benefit. Net
+    benefit is hire value plus salvage, minus cost, plus CO2 avoided at the
+    carbon price. Rows come back ranked, best first, with non-continue actions
+    ahead of the rest.
+    """
+    factors = factors or CircularFactors()
+    coeffs = coeffs or HealthCoefficients()
+    score = health["health_score"].to_numpy(dtype=float)
+    rul = health["RUL_days"].to_numpy(dtype=float)
+    horizon = float(coeffs.rul_horizon_days)
+    band = recommend(score)
+    per_t = factors.carbon_price_AUD_per_t / 1000.0
+
+    # refurbish: buys back life up to refurbish_to_score, deferring part of a replacement
+    gained = np.maximum(factors.refurbish_to_score / 100.0 * horizon - rul, 0.0)
+    refurb_cost = (factors.refurbish_cost_AUD
+                   + factors.refurbish_cost_per_point_AUD * np.maximum(factors.refurbish_to_score - score, 0.0))
+    refurb_co2 = factors.embodied_co2_kg * (gained / horizon - factors.refurbish_co2_share)
+    refurb_net = gained * factors.day_value_AUD - refurb_cost + refurb_co2 * per_t
+
+    # recycle: salvage and material credit, but the remaining life is given up
+    recycle_co2 = np.full(len(score), factors.embodied_co2_kg * factors.recycle_co2_credit)
+    recycle_net = factors.salvage_AUD - rul * factors.day_value_AUD + recycle_co2 * per_t
+
+    # redeploy: the idle share of the remaining life becomes hire days elsewhere
+    if "usage_hours" in health.columns and len(health):
+        usage = health["usage_hours"].to_numpy(dtype=float)
+        typical = np.nanmedian(usage)
+        idle = np.clip(1.0 - usage / typical, 0.0, 1.0) if typical > 0 else np.zeros(len(usage))
+        underused = usage <= np.nanquantile(usage, factors.underused_quantile)
+    else:
+        idle, underused = np.zeros(len(score)), np.zeros(len(score), dtype=bool)
+    redeploy_net = idle * rul * factors.day_value_AUD - factors.redeploy_cost_AUD
+
+    worn = (band == REFURBISH) | (band == RECYCLE)
+    redeploy = ~worn & underused & (redeploy_net > 0)
+    refurbish = worn & (refurb_net >= recycle_net)
+    recycle = worn & ~refurbish
+
+    conditions = [redeploy, refurbish, recycle]
+    action = np.select(conditions, [REDEPLOY, REFURBISH, RECYCLE], default=band)
+    cost = np.select(conditions, [factors.redeploy_cost_AUD, refurb_cost, 0.0], default=0.0)
+    co2 = np.select(conditions, [0.0, refurb_co2, recycle_co2], default=0.0)
+    net = np.select(conditions, [redeploy_net, refurb_net, recycle_net], default=0.0)
+
+    # rank: actions before "keep as is", then by net benefit, then by lowest health
+    keep = ~(redeploy | worn)
+    order = np.lexsort((score, -net, keep))
+    out = pd.DataFrame({
+        "equipment_id": health["equipment_id"].to_numpy()[order],
+        "health_score": score[order],
+        "RUL_days": health["RUL_days"].to_numpy()[order],
+        "band": band[order],
+        "recommendation": action[order],
+        "cost_AUD": np.round(cost[order], 2),
+        "co2_saved_kg": np.round(co2[order], 1),
+        "net_benefit_AUD": np.round(net[order], 2),
+    })
+    out.insert(0, "rank", np.arange(1, len(out) + 1))
+    return out
+
+
+def action_lists(decisions: pd.DataFrame, top: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """The ranked decisions split per action, each keeping the global order."""
+    groups = {action: frame for action, frame in decisions.groupby("recommendation", sort=False)}
+    return {action: (frame if top is None else frame.head(top)).reset_index(drop=True)
+            for action, frame in groups.items()}
+
+
+def circular_recommendation(health: pd.DataFrame, factors: Optional[CircularFactors] = None,
+                            top: Optional[int] = None):
+    """Ranked decisions as report-ready records (equipment_id, recommendation, health_score, ...)."""
+    decisions = decide(health, factors)
+    if top is not None:
+        decisions = decisions.head(top)
+    return decisions.drop(columns=["band"]).assign(health_score=lambda d: d["health_score"].round(1)).to_dict("records")
+
 
 if __name__ == "__main__":
-    print(circular_recommendation())
+    from src.lifecycle import check_equipment_health
+    print(pd.DataFrame(circular_recommendation(check_equipment_health())))
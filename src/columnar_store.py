@@ -0,0 +1,113 @@
+# src/columnar_store.py
+"""
+Parquet copies of the fleet CSVs under data/store/<dataset>/.
+
+GPS and rental data are hive-partitioned by `date` and an `eq_bucket`
+(equipment_id modulo EQUIPMENT_BUCKETS), so readers that filter on either only
+open the matching files; every reader selects columns before decoding.
+
+    python -m src.columnar_store convert            # all datasets
+    python -m src.columnar_store convert gps rental
+"""
+import argparse
+import datetime as dt
+import os
+import shutil
+import uuid
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.data_pipeline import GPS_DTYPES, RENTAL_DTYPES, iter_csv_chunks
+
+STORE_ROOT = "data/store"
+EQUIPMENT_BUCKETS = 16
+
+DATASETS = {
+    "gps":         {"csv": "data/gps_data.csv",           "dtypes": GPS_DTYPES,    "partition": ["date", "eq_bucket"]},
+    "rental":      {"csv": "data/rental_history.csv",     "dtypes": RENTAL_DTYPES, "partition": ["date", "eq_bucket"]},
+    "locations":   {"csv": "data/equipment_location.csv", "dtypes": None,          "partition": []},
+    "cctv":        {"csv": "data/cctv_data.csv",          "dtypes": None,          "partition": []},
+    "shared_pool": {"csv": "data/shared_pool.csv",        "dtypes": None,          "partition": []},
+}
+
+
+def dataset_path(name, root=STORE_ROOT):
+    return os.path.join(root, name)
+
+
+def _add_partition_columns(chunk, partition, ingest_date):
+    if "date" in partition:
+        if "timestamp" in chunk.columns:
+            chunk["date"] = chunk["timestamp"].astype(str).str[:10]
+        elif "date" not in chunk.columns:
+            # no event time in the file: partition by ingest date
+            chunk["date"] = ingest_date
+    if "eq_bucket" in partition:
+        chunk["eq_bucket"] = (chunk["equipment_id"] % EQUIPMENT_BUCKETS).astype("int16")
+    return chunk
+
+
+def convert_csv(name, csv_path=None, root=STORE_ROOT, chunksize=500_000, ingest_date=None):
+    """Rewrite one CSV dataset as Parquet, chunk by chunk. Returns the dataset directory."""
+    spec = DATASETS[name]
+    csv_path = csv_path or spec["csv"]
+    out = dataset_path(name, root)
+    if os.path.exists(out):
+        shutil.rmtree(out)
+    os.makedirs(out)
+    ingest_date = ingest_date or dt.date.today().isoformat()
+
+    for chunk in iter_csv_chunks(csv_path, spec["dtypes"], chunksize=chunksize):
+        chunk = _add_partition_columns(chunk, spec["partition"], ingest_date)
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if spec["partition"]:
+            pq.write_to_dataset(table, out, partition_cols=spec["partition"],
+                                basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet")
+        else:
+            pq.write_table(table, os.path.join(out, f"part-{uuid.uuid4().hex}.parquet"))
+    return out
+
+
+def _dataset(path):
+    return ds.dataset(path, format="parquet", partitioning="hive")
+
+
+def dataset_columns(path):
+    return list(_dataset(path).schema.names)
+
+
+def iter_dataset_chunks(path, columns=None, filters=None, batch_size=250_000):
+    """
+    Yield DataFrame chunks of a Parquet dataset.
+    `filters` are (column, op, value) tuples, e.g. [("eq_bucket", "=", 3), ("date", ">=", "2025-09-01")];
+    partition columns prune whole files, other columns are filtered per row group.
+    """
+    expr = pq.filters_to_expression(filters) if filters else None
+    for batch in _dataset(path).to_batches(columns=columns, filter=expr, batch_size=batch_size):
+        yield batch.to_pandas()
+
+
+def read_dataset(path, columns=None, filters=None):
+    expr = pq.filters_to_expression(filters) if filters else None
+    return _dataset(path).to_table(columns=columns, filter=expr).to_pandas()
+
+
+def equipment_filter(equipment_ids):
+    """Filters selecting only the given equipment (bucket pruning plus exact match)."""
+    ids = sorted({int(i) for i in equipment_ids})
+    buckets = sorted({i % EQUIPMENT_BUCKETS for i in ids})
+    return [("eq_bucket", "in", buckets), ("equipment_id", "in", ids)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert fleet CSVs to partitioned Parquet")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    conv = sub.add_parser("convert")
+    conv.add_argument("datasets", nargs="*", default=list(DATASETS))
+    conv.add_argument("--root", default=STORE_ROOT)
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        print(f"{name}: {DATASETS[name]['csv']} -> {convert_csv(name, root=args.root)}")
@@ -3,16 +3,8 @@ import pandas as pd
 import plotly.express as px
 import pydeck as pdk
 
-from src.data_pipeline import generate_gps_data, generate_rental_history
-from src.demand_model import forecast_demand
+from src.data_context import get_context
 from src.route_vrp import optimize_route
-from src.lifecycle import check_equipment_health
-from src.external_data import get_external_data
-from src.cctv_data import generate_cctv_data
-from src.shared_pool import generate_shared_pool
-from src.equipment_location import generate_equipment_locations
-from src.sustainability import calculate_sustainability
-from src.circular_economy import circular_recommendation
 
 
 # === Page Config ===
@@ -23,17 +15,16 @@ st.markdown("A Hackathon Prototype for **AI-powered Fleet & Equipment Optimizati
 
 
 # --- Data Preparation ---
-gps_df = generate_gps_data()
-rental_df = generate_rental_history()
-demand_forecast = forecast_demand("data/rental_history.csv")
-route = optimize_route(use_mock=True)
-lifecycle_status = check_equipment_health()
-external = get_external_data()
-cctv = generate_cctv_data()
-pool = generate_shared_pool()
-locs = generate_equipment_locations()
-sustain = calculate_sustainability()
-circular = circular_recommendation()
+ctx = get_context()
+gps_df = ctx.gps()
+demand_forecast = ctx.forecast()
+route, _ = optimize_route(use_mock=True)
+lifecycle_status = ctx.health()
+cctv = ctx.cctv()
+pool = ctx.shared_pool()
+locs = ctx.locations()
+sustain = ctx.sustainability()
+circular = ctx.circular()
 
 
 # --- Layout ---
@@ -94,7 +85,7 @@ with tab4:
 # --- Tab 5: Circular Economy ---
 with tab5:
     st.subheader("Circular Economy Recommendation")
-    st.success(circular)
+    st.dataframe(pd.DataFrame(circular))
 
     st.subheader("Shared Equipment Pool")
     st.dataframe(pool)
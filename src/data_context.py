@@ -0,0 +1,207 @@
+# src/data_context.py
+import datetime as dt
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from src.asset_registry import AssetRegistry
+from src.cctv_data import generate_cctv_data
+from src.circular_economy import circular_recommendation
+from src.demand_model import apply_weather
+from src.data_pipeline import csv_columns, generate_gps_data, generate_rental_history
+from src.emissions import EmissionsEngine
+from src.equipment_location import generate_equipment_locations
+from src.external_api import get_region_weather
+from src.lifecycle import mock_usage
+from src.rental_aggregates import RentalAggregateStore
+from src.pool_allocator import PoolAllocator
+from src.shared_pool import generate_shared_pool
+from src.spatial_index import SpatialIndex
+from src.sustainability import calculate_sustainability
+
+DEFAULT_PATHS = {
+    "gps": "data/gps_data.csv",
+    "rental": "data/rental_history.csv",
+    "locations": "data/equipment_location.csv",
+    "weather": "data/weather_forecast.csv",
+}
+
+CIRCULAR_TOP = 25   # circular-economy actions shown / reported
+
+# used only when a source file does not exist yet
+_GENERATORS: Dict[str, Callable] = {
+    "gps": lambda path: generate_gps_data(path=path),
+    "rental": lambda path: generate_rental_history(path=path),
+    "locations": lambda path: generate_equipment_locations(path=path),
+}
+
+
+def _tail_bytes(path: str, end: int, n: int = 4096) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(max(end - n, 0))
+        return f.read(min(n, end))
+
+
+class DataContext:
+    """
+    Loads each dataset once and memoizes derived results for the dashboard.
+
+    Every cached value remembers the (mtime, size) version of the source files
+    it was built from and is rebuilt only when one of them changes, so a
+    Streamlit rerun recomputes just what actually changed on disk.
+    """
+
+    def __init__(self, paths: Optional[Dict[str, str]] = None):
+        self.paths = {**DEFAULT_PATHS, **(paths or {})}
+        self._cache: Dict[str, Tuple[tuple, object]] = {}
+        self._lock = threading.RLock()
+        self.builds: Dict[str, int] = {}       # how often each entry was (re)computed
+        self._aggregates = None                # (store, file version, bytes before EOF)
+
+    def version(self, name: str) -> tuple:
+        path = self.paths[name]
+        if not os.path.exists(path) and name in _GENERATORS:
+            _GENERATORS[name](path)
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def memo(self, key: str, build: Callable, *sources: str, extra: tuple = ()):
+        """
+        Return the cached value for `key`, rebuilding it if any source file
+        changed or `extra` (other inputs, e.g. today's date) differs.
+        """
+        with self._lock:
+            stamp = tuple(self.version(s) for s in sources) + tuple(extra)
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] == stamp:
+                return hit[1]
+            value = build()
+            self._cache[key] = (stamp, value)
+            self.builds[key] = self.builds.get(key, 0) + 1
+            return value
+
+    def invalidate(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+    # --- datasets ---
+    def load(self, name: str) -> pd.DataFrame:
+        return self.memo(f"load:{name}", lambda: pd.read_csv(self.paths[name]), name)
+
+    def gps(self) -> pd.DataFrame:
+        return self.load("gps")
+
+    def locations(self) -> pd.DataFrame:
+        return self.load("locations")
+
+    # --- derived results ---
+    def rental_aggregates(self) -> RentalAggregateStore:
+        """
+        Rollups of the rental log. When the file only grew, just the appended
+        bytes are parsed; any other change rebuilds the store.
+        """
+        with self._lock:
+            path = self.paths["rental"]
+            stamp = self.version("rental")
+            if self._aggregates is not None and self._aggregates[1] == stamp:
+                return self._aggregates[0]
+            store, seen_size, seen_tail = None, 0, b""
+            if self._aggregates is not None:
+                store, (_, seen_size), seen_tail = self._aggregates
+            if store is not None and stamp[1] > seen_size and _tail_bytes(path, seen_size) == seen_tail:
+                with open(path, "rb") as f:
+                    f.seek(seen_size)
+                    store.append(pd.read_csv(f, header=None, names=csv_columns(path).keys()))
+            else:
+                store = RentalAggregateStore.from_file(path)
+            self.builds["rental_aggregates"] = self.builds.get("rental_aggregates", 0) + 1
+            self._aggregates = (store, stamp, _tail_bytes(path, stamp[1]))
+            return store
+
+    def _weather_sources(self) -> tuple:
+        # without the weather file the mock provider is used, which has nothing to version
+        return ("weather",) if os.path.exists(self.paths["weather"]) else ()
+
+    def weather(self) -> pd.DataFrame:
+        """Per-day weather demand factors over the horizon starting today."""
+        today = dt.date.today()                # the horizon moves with the date, whatever the provider
+        return self.memo("weather", lambda: get_region_weather(start=today), *self._weather_sources(),
+                         extra=(today,))
+
+    def forecast(self) -> pd.DataFrame:
+        """
+        Per-project demand with the weather demand factor applied (weather_adjusted_days).
+        The per-project totals carry no date or region, so apply_weather uses the
+        mean factor of the whole horizon.
+        """
+        return self.memo("forecast", lambda: apply_weather(self.rental_aggregates().forecast_demand(), self.weather()),
+                         "rental", *self._weather_sources(), extra=(dt.date.today(),))
+
+    def region_trend(self) -> pd.DataFrame:
+        return self.memo("region_trend", lambda: self.rental_aggregates().region_trend(), "rental")
+
+    def sustainability(self) -> dict:
+        return self.memo("sustainability", lambda: calculate_sustainability(self.paths["gps"]), "gps")
+
+    def emissions(self) -> EmissionsEngine:
+        return self.memo("emissions", lambda: EmissionsEngine.from_file(self.paths["gps"]), "gps")
+
+    def positions(self) -> SpatialIndex:
+        """Spatial index of the latest GPS position of every asset."""
+        return self.memo("positions", lambda: SpatialIndex.from_gps(self.paths["gps"]), "gps")
+
+    def usage(self) -> pd.DataFrame:
+        # usage totals are still mocked (check_equipment_health's fallback data)
+        return self.memo("usage", mock_usage)
+
+    def health(self) -> pd.DataFrame:
+        """check_equipment_health-shaped frame, scored in place on the asset registry."""
+        return self.memo("health", lambda: self.assets().health_frame(), "gps")
+
+    def cctv(self) -> pd.DataFrame:
+        return self.memo("cctv", generate_cctv_data)
+
+    def shared_pool(self) -> pd.DataFrame:
+        return self.memo("shared_pool", generate_shared_pool)
+
+    def assets(self) -> AssetRegistry:
+        """
+        Every asset seen in GPS, pool, usage and emissions data, keyed by canonical
+        id. Health is scored here from the registry's own columns, and health(),
+        circular() and the pool allocator all read from it.
+        """
+        def build():
+            registry = AssetRegistry()
+            registry.ingest_gps(self.gps())
+            registry.ingest_pool(self.shared_pool())
+            registry.ingest_emissions(self.emissions().by_equipment())
+            registry.ingest_usage(self.usage())
+            registry.score_health()
+            return registry
+        return self.memo("assets", build, "gps")
+
+    def pool_allocator(self) -> PoolAllocator:
+        # pool units take their positions from the GPS trace through the registry
+        return self.memo("pool_allocator", lambda: PoolAllocator(self.assets().pool_frame()), "gps")
+
+    def circular(self) -> list:
+        # the top-ranked actions only: this list goes into the dashboard table and the PDF
+        return self.memo("circular", lambda: circular_recommendation(self.health(), top=CIRCULAR_TOP), "gps")
+
+
+_context: Optional[DataContext] = None
+_context_lock = threading.Lock()
+
+
+def get_context() -> DataContext:
+    """Process-wide context shared by app.py and src/dashboard.py across reruns."""
+    global _context
+    with _context_lock:
+        if _context is None:
+            _context = DataContext()
+        return _context
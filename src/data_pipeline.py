@@ -1,34 +1,189 @@
 # src/data_pipeline.py
+import os
+
 import pandas as pd
 import numpy as np
 
-def generate_gps_data(num_records=100, path="data/gps_data.csv"):
+PROJECTS = ["Highway", "Bridge", "Metro"]
+EQUIPMENT_TYPES = ["Excavator", "Bulldozer", "Crane", "Truck", "Forklift"]
+REGIONS = ["VIC", "NSW", "QLD"]
+
+
+def _rng(seed):
+    # a private Generator per call, so generating data never touches global RNG state
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+def _write(df, path):
+    if path:
+        df.to_csv(path, index=False)
+    return df
+
+
+def generate_gps_data(num_records=100, path=None, seed=42, num_assets=None, start="2025-09-29"):
     """
     Generate mock GPS data for equipment.
+    By default each record is its own asset; with `num_assets`, records are pings of
+    that many assets in time order, each with its own increasing odometer.
+    Written to `path` only when one is given.
     """
-    np.random.seed(42)
+    rng = _rng(seed)
+    step_km = rng.integers(1, 10, num_records)
+    if num_assets is None:
+        equipment_id = np.arange(1, num_records + 1)
+        mileage = np.cumsum(step_km)
+    else:
+        equipment_id = rng.integers(1, num_assets + 1, num_records)
+        start_km = rng.integers(0, 20_000, num_assets + 1)
+        mileage = (pd.Series(step_km).groupby(equipment_id).cumsum().to_numpy()
+                   + start_km[equipment_id])
+    seconds = np.sort(rng.integers(0, max(num_records, 1) * 60, num_records))
     data = {
-        "equipment_id": np.arange(1, num_records + 1),
-        "lat": np.random.uniform(-38, -33, num_records),
-        "lon": np.random.uniform(144, 151, num_records),
-        "mileage_km": np.cumsum(np.random.randint(1, 10, num_records)),
-        "fuel_L_per_100km": np.random.uniform(15, 30, num_records)
+        "timestamp": (pd.Timestamp(start) + pd.to_timedelta(seconds, unit="s")).strftime("%Y-%m-%d %H:%M:%S"),
+        "equipment_id": equipment_id,
+        "lat": rng.uniform(-38, -33, num_records),
+        "lon": rng.uniform(144, 151, num_records),
+        "mileage_km": mileage,
+        "fuel_L_per_100km": rng.uniform(15, 30, num_records)
     }
-    df = pd.DataFrame(data)
-    df.to_csv(path, index=False)
-    return df   
+    return _write(pd.DataFrame(data), path)
 
 
-def generate_rental_history(num_records=50, path="data/rental_history.csv"):
+def generate_rental_history(num_records=50, path=None, seed=24, num_assets=19):
     """
-    Generate mock rental history data.
+    Generate mock rental history data. Written to `path` only when one is given.
     """
-    np.random.seed(24)
+    rng = _rng(seed)
     data = {
-        "equipment_id": np.random.randint(1, 20, num_records),
-        "rental_days": np.random.randint(1, 30, num_records),
-        "project": np.random.choice(["Highway", "Bridge", "Metro"], num_records)
+        "equipment_id": rng.integers(1, num_assets + 1, num_records),
+        "rental_days": rng.integers(1, 30, num_records),
+        "project": rng.choice(PROJECTS, num_records),
+        # time-series / segment columns for the forecasting engine
+        "start_date": (pd.Timestamp("2025-01-06")
+                       + pd.to_timedelta(rng.integers(0, 270, num_records), unit="D")).strftime("%Y-%m-%d"),
+        "equipment_type": rng.choice(EQUIPMENT_TYPES, num_records),
+        "region": rng.choice(REGIONS, num_records),
     }
-    df = pd.DataFrame(data)
-    df.to_csv(path, index=False)
-    return df   
+    return _write(pd.DataFrame(data), path)
+
+
+# === Streaming ingestion ===
+# Explicit dtypes keep memory per chunk predictable; keys are the normalized
+# (stripped, lower-case) column names, matched against whatever the file header uses.
+# An int64 equipment_id in "EQT001" form is parsed as text and canonicalized to 1.
+GPS_DTYPES = {
+    "equipment_id": "int64",
+    "lat": "float32",
+    "lon": "float32",
+    "mileage_km": "float64",
+    "fuel_l_per_100km": "float32",
+}
+RENTAL_DTYPES = {
+    "equipment_id": "int64",
+    "rental_days": "int32",
+    "project": "category",
+    "equipment": "category",
+    "equipment_type": "category",
+    "region": "category",
+    "start_date": "str",
+}
+DEFAULT_CHUNKSIZE = 250_000
+
+
+def csv_columns(path):
+    """Map normalized column name -> column name as written in the file header."""
+    header = pd.read_csv(path, nrows=0).columns
+    return {c.strip().lower(): c for c in header}
+
+
+def _canonical_ids(ids: pd.Series) -> np.ndarray:
+    # plain digits are the common case; anything else goes through the EQT-aware parser
+    if ids.notna().all() and ids.str.isdigit().all():
+        return ids.to_numpy(dtype=np.int64)
+    from src.asset_registry import normalize_ids
+    return normalize_ids(ids)
+
+
+def iter_csv_chunks(path, dtypes=None, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Yield a CSV as DataFrame chunks of at most `chunksize` rows.
+    Only `columns` (normalized names) are parsed; chunk columns come back normalized.
+    Raises ValueError for equipment ids that are neither integers nor EQT-numbered.
+    """
+    available = csv_columns(path)
+    wanted = list(columns) if columns is not None else list(available)
+    missing = [c for c in wanted if c not in available]
+    if missing:
+        raise KeyError(f"{path} has no column(s) {missing}")
+
+    raw = [available[c] for c in wanted]
+    dtype = {available[c]: t for c, t in (dtypes or {}).items() if c in wanted}
+    rename = {available[c]: c for c in wanted}
+    text_ids = False
+    if dtype.get(available.get("equipment_id")) == "int64":
+        # sniff the head: plain integer ids keep the fast int64 parse, others are read as text
+        head = pd.read_csv(path, usecols=[available["equipment_id"]], nrows=1000).iloc[:, 0]
+        text_ids = not pd.api.types.is_integer_dtype(head)
+        if text_ids:
+            dtype[available["equipment_id"]] = "str"
+    for chunk in pd.read_csv(path, usecols=raw, dtype=dtype, chunksize=chunksize):
+        chunk = chunk.rename(columns=rename)
+        if text_ids:
+            chunk["equipment_id"] = _canonical_ids(chunk["equipment_id"])
+        yield chunk
+
+
+def table_columns(path):
+    """Normalized column names of a CSV file or a columnar dataset directory."""
+    if os.path.isdir(path):
+        from src.columnar_store import dataset_columns
+        return dataset_columns(path)
+    return list(csv_columns(path))
+
+
+def iter_table_chunks(path, dtypes=None, columns=None, chunksize=DEFAULT_CHUNKSIZE, filters=None):
+    """
+    Chunks of a CSV file, or of a Parquet dataset directory written by
+    src.columnar_store. `filters` ((column, op, value) tuples) are pushed down
+    to the Parquet reader and are only supported for datasets.
+    """
+    if os.path.isdir(path):
+        from src.columnar_store import iter_dataset_chunks
+        return iter_dataset_chunks(path, columns, filters, chunksize)
+    if filters:
+        raise ValueError("filters need a columnar dataset; convert the CSV with src.columnar_store")
+    return iter_csv_chunks(path, dtypes, columns, chunksize)
+
+
+def iter_gps_chunks(path="data/gps_data.csv", columns=None, chunksize=DEFAULT_CHUNKSIZE, filters=None):
+    return iter_table_chunks(path, GPS_DTYPES, columns, chunksize, filters)
+
+
+def iter_rental_chunks(path="data/rental_history.csv", columns=None, chunksize=DEFAULT_CHUNKSIZE, filters=None):
+    return iter_table_chunks(path, RENTAL_DTYPES, columns, chunksize, filters)
+
+
+class GroupSumReducer:
+    """Running groupby(key)[value].sum() over a stream of chunks."""
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.total = pd.Series(dtype="int64")
+
+    def update(self, chunk):
+        part = chunk.groupby(self.key, observed=True)[self.value].sum()
+        part.index = part.index.astype(object)
+        self.total = self.total.add(part, fill_value=0)
+        return self
+
+    def result(self):
+        out = self.total.sort_index().astype("int64")
+        return out.rename_axis(self.key).rename(self.value).reset_index()
+
+
+def reduce_chunks(chunks, reducer):
+    """Feed every chunk to `reducer.update` and return `reducer.result()`."""
+    for chunk in chunks:
+        reducer.update(chunk)
+    return reducer.result()
@@ -1,43 +1,64 @@
 import pandas as pd
 
-import pandas as pd
+from src.data_pipeline import GroupSumReducer, iter_rental_chunks, reduce_chunks, table_columns
 
-def forecast_demand(file_path):
-    df = pd.read_csv(file_path)
-    df.columns = df.columns.str.strip().str.lower() 
-    
-    print("Cleaned columns:", df.columns.tolist())  # Debug
-    
 
-    if "equipment" in df.columns:
-        group_col = "equipment"
-    elif "project" in df.columns:
-        group_col = "project"
-    else:
-        raise KeyError("CSV must contain either 'equipment' or 'project' column")
-    
-    summary = df.groupby(group_col)["rental_days"].sum().reset_index()
+def _rental_totals(file_path, candidates, chunksize=None, filters=None):
+    """
+    Stream the rental file (CSV or columnar dataset) and sum rental_days
+    by the first candidate column present.
+    """
+    columns = table_columns(file_path)
+    group_col = next((c for c in candidates if c in columns), None)
+    if group_col is None:
+        raise KeyError(f"CSV must contain either {' or '.join(repr(c) for c in candidates)} column")
+
+    kwargs = {"chunksize": chunksize} if chunksize else {}
+    chunks = iter_rental_chunks(file_path, columns=[group_col, "rental_days"], filters=filters, **kwargs)
+    return reduce_chunks(chunks, GroupSumReducer(group_col, "rental_days")), group_col
+
+def forecast_demand(file_path="data/rental_history.csv", chunksize=None, filters=None):
+    summary, group_col = _rental_totals(file_path, ["equipment", "project"], chunksize, filters)
     summary.rename(columns={"rental_days": "demand_forecast_days"}, inplace=True)
     summary.rename(columns={group_col: "project"}, inplace=True)  
     
     return summary
 
-def region_trend(file_path):
-    df = pd.read_csv(file_path)
-    df.columns = df.columns.str.strip().str.lower()
-
-
-    if "region" in df.columns:
-        summary = df.groupby("region")["rental_days"].sum().reset_index()
-        summary.rename(columns={"rental_days": "total_days"}, inplace=True)
-        return summary
-   
-    elif "project" in df.columns:
-        summary = df.groupby("project")["rental_days"].sum().reset_index()
-        summary.rename(columns={"rental_days": "total_days"}, inplace=True)
-        return summary
-    else:
-        raise KeyError("CSV must have 'region' or 'project'")
+def region_trend(file_path="data/rental_history.csv", chunksize=None, filters=None):
+    summary, _ = _rental_totals(file_path, ["region", "project"], chunksize, filters)
+    summary.rename(columns={"rental_days": "total_days"}, inplace=True)
+    return summary
+
+def apply_weather(forecast, weather, date_col="week", value_col="demand_forecast_days"):
+    """
+    Join weather demand factors onto a dated forecast (e.g. DemandForecaster.predict)
+    and add `weather_adjusted_days`. Weekly forecasts (date_col="week") use the mean
+    daily factor of that week; rows are matched on region when both sides have one,
+    otherwise on the fleet-wide mean. Days without weather keep a factor of 1.0.
+    A forecast without `date_col` (a per-project total over the coming period)
+    takes the mean factor of the whole weather horizon.
+    """
+    if date_col not in forecast.columns:
+        out = forecast.copy()
+        factor = float(weather["demand_factor"].mean()) if len(weather) else 1.0
+        out["demand_factor"] = round(factor, 4)
+        out["weather_adjusted_days"] = (out[value_col] * factor).round(2)
+        return out
+
+    w = weather[["date", "region", "demand_factor"]].copy()
+    w["date"] = pd.to_datetime(w["date"]).dt.normalize()
+    if date_col == "week":
+        w["date"] = w["date"].dt.to_period("W-SUN").dt.start_time
+
+    out = forecast.copy()
+    out["_date"] = pd.to_datetime(out[date_col]).dt.normalize()
+    by_region = "region" in out.columns and not set(w["region"]) <= {"ALL"}
+    keys = ["date", "region"] if by_region else ["date"]
+    factors = w.groupby(keys, as_index=False)["demand_factor"].mean().rename(columns={"date": "_date"})
+    out = out.merge(factors, on=["_date"] + keys[1:], how="left").drop(columns="_date")
+    out["demand_factor"] = out["demand_factor"].fillna(1.0)
+    out["weather_adjusted_days"] = (out[value_col] * out["demand_factor"]).round(2)
+    return out
 
 
 # === Debug Test ===
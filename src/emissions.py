@@ -0,0 +1,245 @@
+# src/emissions.py
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_pipeline import iter_gps_chunks, table_columns
+
+
+@dataclass
+class EmissionFactors:
+    co2_kg_per_L: float = 2.31       # diesel, same default as calculate_sustainability
+    fuel_cost_per_L: float = 1.8     # AUD
+
+
+_SUMS = ["distance_km", "fuel_L"]
+
+
+def _with_factors(df: pd.DataFrame, f: EmissionFactors) -> pd.DataFrame:
+    df["co2_kg"] = df["fuel_L"] * f.co2_kg_per_L
+    df["cost_AUD"] = df["fuel_L"] * f.fuel_cost_per_L
+    return df
+
+
+class EmissionsEngine:
+    """
+    Distance, fuel, CO2 and cost per equipment, per trip and per period from a GPS trace.
+
+    Each ping contributes the odometer delta since the same asset's previous
+    ping, burnt at that ping's fuel rate. The last reading of every asset is
+    carried between `update` calls, so a trace can be fed in chunks (or as new
+    pings arrive) and only the new rows are processed. A trip ends when an asset
+    is silent for longer than `trip_gap`; without timestamps each asset has a
+    single trip. Per-asset totals live in dense arrays. Rows are sorted by
+    (asset, time), so trips and periods are contiguous runs summed with
+    `np.add.reduceat`; partials from successive updates are merged with one
+    groupby when they pile up.
+    """
+
+    def __init__(self, factors: Optional[EmissionFactors] = None, trip_gap: str = "30min",
+                 period: str = "D", capacity: int = 1024):
+        self.factors = factors or EmissionFactors()
+        self.trip_gap = pd.Timedelta(trip_gap).value
+        self.period = period
+        self.rows_ingested = 0
+        self._row: Dict[object, int] = {}
+        self._ids = np.empty(capacity, dtype=object)
+        self._km = np.zeros(capacity)
+        self._fuel = np.zeros(capacity)
+        self._pings = np.zeros(capacity, dtype=np.int64)
+        self._trips = np.zeros(capacity, dtype=np.int64)
+        self._seen = np.zeros(capacity, dtype=bool)
+        self._last_odo = np.zeros(capacity)
+        self._last_ts = np.zeros(capacity, dtype=np.int64)
+        self._trip_parts: List[pd.DataFrame] = []
+        self._period_parts: List[pd.DataFrame] = []
+
+    def __len__(self):
+        return len(self._row)
+
+    # --- internals ---
+    def _grow(self, needed: int):
+        cap = len(self._ids)
+        if needed <= cap:
+            return
+        new_cap = max(needed, cap * 2)
+        for name in ("_ids", "_km", "_fuel", "_pings", "_trips", "_seen", "_last_odo", "_last_ts"):
+            old = getattr(self, name)
+            arr = np.zeros(new_cap, dtype=old.dtype) if old.dtype != object else np.empty(new_cap, dtype=object)
+            arr[:cap] = old
+            setattr(self, name, arr)
+
+    def _rows_for(self, ids: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(ids)
+        new = [i for i in uniques if i not in self._row]
+        if new:
+            start = len(self._row)
+            self._grow(start + len(new))
+            for k, eid in enumerate(new):
+                self._row[eid] = start + k
+                self._ids[start + k] = eid
+        lookup = np.fromiter((self._row[i] for i in uniques), dtype=np.int64, count=len(uniques))
+        return lookup[codes]
+
+    @staticmethod
+    def _runs(begin: np.ndarray, r: np.ndarray, km: np.ndarray, fuel: np.ndarray, **cols) -> pd.DataFrame:
+        """One row per run of consecutive rows starting where `begin` is set."""
+        at = np.flatnonzero(begin)
+        stop = np.r_[at[1:], len(r)] - 1
+        out = {"row": r[at]}
+        for name, values in cols.items():
+            out[name] = values[stop] if name == "end" else values[at]
+        out["distance_km"] = np.add.reduceat(km, at)
+        out["fuel_L"] = np.add.reduceat(fuel, at)
+        return pd.DataFrame(out)
+
+    @staticmethod
+    def _compact(parts: List[pd.DataFrame], keys: List[str], agg: dict) -> List[pd.DataFrame]:
+        if len(parts) <= 1:
+            return parts
+        merged = pd.concat(parts, ignore_index=True)
+        return [merged.groupby(keys, as_index=False, sort=False, dropna=False).agg(agg)]
+
+    # --- ingestion ---
+    def update(self, pings: pd.DataFrame) -> int:
+        """
+        Fold GPS pings into the totals: equipment_id, mileage_km, fuel_l_per_100km
+        and optionally timestamp. Returns rows processed.
+        """
+        n = len(pings)
+        if n == 0:
+            return 0
+        df = pings.rename(columns=lambda c: c.strip().lower())
+        rows = self._rows_for(df["equipment_id"])
+        has_ts = "timestamp" in df.columns
+        ts = (pd.to_datetime(df["timestamp"], format="ISO8601").to_numpy(dtype="datetime64[ns]").astype(np.int64)
+              if has_ts else np.zeros(n, dtype=np.int64))
+
+        order = np.lexsort((ts, rows))          # stable: file order breaks timestamp ties
+        r, ts = rows[order], ts[order]
+        odo = df["mileage_km"].to_numpy(dtype=float)[order]
+        rate = df["fuel_l_per_100km"].to_numpy(dtype=float)[order]
+
+        first = np.ones(n, dtype=bool)
+        first[1:] = r[1:] != r[:-1]
+        last = np.ones(n, dtype=bool)
+        last[:-1] = first[1:]
+        starts = np.flatnonzero(first)
+
+        prev_odo = np.empty(n)
+        prev_odo[1:] = odo[:-1]
+        prev_ts = np.empty(n, dtype=np.int64)
+        prev_ts[1:] = ts[:-1]
+        has_prev = ~first
+        prev_odo[first], prev_ts[first] = self._last_odo[r[first]], self._last_ts[r[first]]
+        has_prev[first] = self._seen[r[first]]
+
+        # odometer resets or out-of-order readings count as zero distance
+        km = np.where(has_prev, np.clip(odo - prev_odo, 0, None), 0.0)
+        fuel = km / 100 * rate
+        new_trip = ~has_prev
+        if has_ts:
+            new_trip |= (ts - prev_ts) > self.trip_gap
+
+        # running trip number per asset: trips opened so far + new trips in this chunk
+        opened = np.cumsum(new_trip)
+        group = np.cumsum(first) - 1
+        base = opened[starts] - new_trip[starts]
+        in_chunk = opened - base[group]
+        trip = self._trips[r] + in_chunk - 1
+
+        np.add.at(self._km, r, km)
+        np.add.at(self._fuel, r, fuel)
+        np.add.at(self._pings, r, 1)
+        ends = r[last]
+        self._trips[ends] += in_chunk[last]
+        self._seen[ends] = True
+        self._last_odo[ends], self._last_ts[ends] = odo[last], ts[last]
+
+        stamps = ts.view("datetime64[ns]") if has_ts else np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")
+        self._trip_parts.append(self._runs(first | new_trip, r, km, fuel, trip=trip,
+                                           start=stamps, end=stamps))
+        period = pd.DatetimeIndex(stamps).floor(self.period).to_numpy()
+        changed = np.ones(n, dtype=bool)
+        changed[1:] = period[1:].view(np.int64) != period[:-1].view(np.int64)     # NaT == NaT here
+        self._period_parts.append(self._runs(first | changed, r, km, fuel, period=period))
+        if len(self._trip_parts) > 8:
+            self._trip_parts = self._compact(self._trip_parts, ["row", "trip"],
+                                             {"start": "min", "end": "max", "distance_km": "sum", "fuel_L": "sum"})
+            self._period_parts = self._compact(self._period_parts, ["row", "period"], dict.fromkeys(_SUMS, "sum"))
+        self.rows_ingested += n
+        return n
+
+    @classmethod
+    def from_file(cls, gps_path="data/gps_data.csv", chunksize=None, filters=None, **kwargs):
+        engine = cls(**kwargs)
+        columns = ["equipment_id", "mileage_km", "fuel_l_per_100km"]
+        if "timestamp" in table_columns(gps_path):
+            columns.insert(0, "timestamp")
+        extra = {"chunksize": chunksize} if chunksize else {}
+        for chunk in iter_gps_chunks(gps_path, columns=columns, filters=filters, **extra):
+            engine.update(chunk)
+        return engine
+
+    # --- queries ---
+    def by_equipment(self) -> pd.DataFrame:
+        n = len(self._row)
+        out = pd.DataFrame({
+            "equipment_id": self._ids[:n],
+            "distance_km": self._km[:n],
+            "fuel_L": self._fuel[:n],
+            "trips": self._trips[:n],
+            "pings": self._pings[:n],
+        })
+        return _with_factors(out, self.factors)
+
+    def by_trip(self) -> pd.DataFrame:
+        self._trip_parts = self._compact(self._trip_parts, ["row", "trip"],
+                                         {"start": "min", "end": "max", "distance_km": "sum", "fuel_L": "sum"})
+        if not self._trip_parts:
+            return _with_factors(pd.DataFrame(columns=["equipment_id", "trip", "start", "end"] + _SUMS), self.factors)
+        t = self._trip_parts[0].sort_values(["row", "trip"])
+        out = t.drop(columns="row")
+        out.insert(0, "equipment_id", self._ids[t["row"].to_numpy()])
+        return _with_factors(out.reset_index(drop=True), self.factors)
+
+    def rollup(self, by: str = "fleet", regions: Optional[Mapping] = None, freq: Optional[str] = None) -> pd.DataFrame:
+        """
+        Totals for the whole fleet ("fleet"), per region ("region"; `regions` maps
+        equipment_id -> region, unmapped assets go under "Unknown") or per period
+        ("period"; `freq` such as "W" or "M", default the engine's period).
+        """
+        if by == "fleet":
+            eq = self.by_equipment()
+            out = pd.DataFrame({"assets": [len(eq)], "trips": [eq["trips"].sum()],
+                                "distance_km": [eq["distance_km"].sum()], "fuel_L": [eq["fuel_L"].sum()]})
+            return _with_factors(out, self.factors)
+        if by == "region":
+            eq = self.by_equipment()
+            eq["region"] = eq["equipment_id"].map(pd.Series(regions or {})).fillna("Unknown")
+            out = eq.groupby("region", as_index=False).agg(
+                assets=("equipment_id", "size"), trips=("trips", "sum"),
+                distance_km=("distance_km", "sum"), fuel_L=("fuel_L", "sum"))
+            return _with_factors(out, self.factors)
+        if by == "period":
+            self._period_parts = self._compact(self._period_parts, ["row", "period"], dict.fromkeys(_SUMS, "sum"))
+            p = self._period_parts[0] if self._period_parts else pd.DataFrame(columns=["period"] + _SUMS)
+            p = p.dropna(subset=["period"])
+            key = p["period"].dt.to_period(freq).dt.start_time if freq else p["period"]
+            out = p.groupby(key.rename("period"))[_SUMS].sum().reset_index()
+            return _with_factors(out, self.factors)
+        raise ValueError(f"unknown rollup {by!r}; use 'fleet', 'region' or 'period'")
+
+
+def equipment_emissions(gps_path="data/gps_data.csv", factors: Optional[EmissionFactors] = None,
+                        chunksize=None, filters=None) -> pd.DataFrame:
+    """Per-equipment distance, fuel, CO2 and cost for a GPS file or dataset."""
+    return EmissionsEngine.from_file(gps_path, chunksize, filters, factors=factors).by_equipment()
+
+
+if __name__ == "__main__":
+    engine = EmissionsEngine.from_file()
+    print(engine.rollup("fleet"))
+    print(engine.by_equipment().sort_values("co2_kg", ascending=False).head(10))
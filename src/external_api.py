@@ -1,19 +1,117 @@
 # src/external_data.py
-import pandas as pd
+import datetime as dt
+import os
 import random
+import threading
+import time
+from typing import Optional, Sequence
+
+import pandas as pd
+
+CONDITIONS = ["Sunny", "Rain", "Storm", "Cloudy"]
+DEMAND_FACTORS = {"Rain": 1.2}   # anything else is 1.0
+WEATHER_COLUMNS = ["date", "region", "day", "condition", "demand_factor"]
+
+
+class WeatherProvider:
+    """Source of per-day, per-region weather and its demand_factor."""
+
+    def fetch(self, regions: Sequence[str], days: int, start: dt.date) -> pd.DataFrame:
+        """Return WEATHER_COLUMNS for every region and each of `days` days from `start`."""
+        raise NotImplementedError
 
-def get_weather_forecast(n=7):
-    conditions = ["Sunny", "Rain", "Storm", "Cloudy"]
-    rows = []
-    for day in range(1, n+1):
-        condition = random.choice(conditions)
-        demand_factor = 1.2 if condition == "Rain" else 1.0
-        rows.append({
-            "day": f"Day {day}",
-            "condition": condition,
-            "demand_factor": demand_factor
+
+class MockWeatherProvider(WeatherProvider):
+    """Random conditions, as the prototype has always used."""
+
+    def fetch(self, regions, days, start):
+        n = len(regions) * days
+        conditions = [random.choice(CONDITIONS) for _ in range(n)]
+        df = pd.DataFrame({
+            "date": pd.Timestamp(start) + pd.to_timedelta([d for _ in regions for d in range(days)], unit="D"),
+            "region": [r for r in regions for _ in range(days)],
+            "day": [f"Day {d}" for _ in regions for d in range(1, days + 1)],
+            "condition": conditions,
         })
-    return pd.DataFrame(rows)
+        df["demand_factor"] = df["condition"].map(DEMAND_FACTORS).fillna(1.0)
+        return df[WEATHER_COLUMNS]
+
+
+class FileWeatherProvider(WeatherProvider):
+    """
+    Local stand-in for a weather API: a CSV of region, day ("Day 1".."Day N"),
+    condition and optional demand_factor, read relative to the requested start date.
+    """
+
+    def __init__(self, path="data/weather_forecast.csv"):
+        self.path = path
+
+    def fetch(self, regions, days, start):
+        df = pd.read_csv(self.path)
+        offset = df["day"].str.extract(r"(\d+)", expand=False).astype(int) - 1
+        df = df[offset < days].copy()
+        df["date"] = pd.Timestamp(start) + pd.to_timedelta(offset[df.index], unit="D")
+        if "demand_factor" not in df.columns:
+            df["demand_factor"] = df["condition"].map(DEMAND_FACTORS).fillna(1.0)
+        if regions and "ALL" not in regions:
+            df = df[df["region"].isin(regions)]
+        return df[WEATHER_COLUMNS].reset_index(drop=True)
+
+
+class CachedWeatherProvider(WeatherProvider):
+    """Wraps a provider; identical requests within `ttl_s` seconds are served from memory."""
+
+    def __init__(self, provider: WeatherProvider, ttl_s: float = 900):
+        self.provider = provider
+        self.ttl_s = ttl_s
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, regions, days, start):
+        key = (tuple(regions), days, start)
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1].copy()
+        df = self.provider.fetch(regions, days, start)
+        with self._lock:
+            self._cache[key] = (now + self.ttl_s, df)
+        return df.copy()
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_default_provider: Optional[WeatherProvider] = None
+
+
+def default_provider() -> WeatherProvider:
+    """Cached file provider when data/weather_forecast.csv exists, else cached mock."""
+    global _default_provider
+    if _default_provider is None:
+        base = FileWeatherProvider() if os.path.exists("data/weather_forecast.csv") else MockWeatherProvider()
+        _default_provider = CachedWeatherProvider(base)
+    return _default_provider
+
+
+def get_region_weather(regions=("ALL",), n=7, start: Optional[dt.date] = None,
+                       provider: Optional[WeatherProvider] = None) -> pd.DataFrame:
+    provider = provider or default_provider()
+    return provider.fetch(list(regions), n, start or dt.date.today())
+
+
+def fleet_weather(df: pd.DataFrame) -> pd.DataFrame:
+    """Fleet-wide day, condition, demand_factor view of get_region_weather output."""
+    if df["region"].nunique() > 1:
+        # fleet-wide view of a per-region source
+        df = (df.groupby(["date", "day"], as_index=False)
+                .agg(condition=("condition", lambda s: s.mode().iloc[0]), demand_factor=("demand_factor", "mean")))
+    return df[["day", "condition", "demand_factor"]].reset_index(drop=True)
+
+def get_weather_forecast(n=7, provider: Optional[WeatherProvider] = None):
+    return fleet_weather(get_region_weather(("ALL",), n, provider=provider))
 
 if __name__ == "__main__":
     print(get_weather_forecast())
@@ -0,0 +1,217 @@
+# src/forecast_engine.py
+import hashlib
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SEGMENT_KEYS = ["project", "equipment_type", "region"]
+FEATURE_COLS = ["demand_factor"]
+
+
+def _week_start(values) -> pd.Series:
+    return pd.to_datetime(pd.Series(values)).dt.to_period("W-SUN").dt.start_time
+
+
+def _fit_batch(Y: np.ndarray, F: np.ndarray, season_length: int, ridge: float):
+    """
+    Fit every row of Y (segments x weeks) at once: a seasonal mean profile
+    plus ridge regression of the residual on [1, t, features].
+    """
+    n, T = Y.shape
+    phase = np.arange(T) % season_length
+    onehot = np.eye(season_length)[phase]                        # (T, L)
+    profile = (Y @ onehot) / np.maximum(onehot.sum(axis=0), 1)  # (n, L)
+    resid = Y - profile[:, phase]
+
+    X = _design(np.broadcast_to(np.arange(T), (n, T)), F)       # (n, T, p)
+    p = X.shape[2]
+    XtX = np.einsum("ntp,ntq->npq", X, X) + ridge * np.eye(p)
+    Xty = np.einsum("ntp,nt->np", X, resid)
+    beta = np.linalg.solve(XtX, Xty[..., None])[..., 0]
+    return profile, beta
+
+
+def _design(t: np.ndarray, F: np.ndarray) -> np.ndarray:
+    ones = np.ones(t.shape + (1,))
+    return np.concatenate([ones, t[..., None].astype(float), F], axis=2)
+
+
+def _segment_hashes(seg: np.ndarray, week_ns: np.ndarray, days: np.ndarray, feats: np.ndarray,
+                    n_seg: int) -> List[str]:
+    """
+    Digest of each segment's own (week, rental_days, features) observations.
+    Weeks are absolute (ns since epoch), so trimming or backfilling other
+    history does not change the digest of a segment whose rows are the same;
+    a revised feature (e.g. a new weather factor) for one of its weeks does.
+    """
+    order = np.lexsort((days, week_ns, seg))
+    seg = seg[order]
+    bounds = np.searchsorted(seg, np.arange(n_seg + 1))
+    rows = np.column_stack([week_ns[order], days[order], np.ascontiguousarray(feats[order]).view(np.int64)])
+    return [hashlib.sha1(rows[bounds[i]:bounds[i + 1]].tobytes()).hexdigest()
+            for i in range(n_seg)]
+
+
+class DemandForecaster:
+    """
+    Weekly rental-day forecasts per segment (project x equipment type x region).
+
+    Each segment gets a seasonal baseline plus a regression on trend and
+    external features (weather `demand_factor`), fitted for thousands of
+    segments at a time with batched normal equations. `fit` only refits
+    segments whose rental history or features changed since the last fit;
+    the others keep their parameters and forecast from their last fitted week.
+    """
+
+    def __init__(self, keys: Sequence[str] = SEGMENT_KEYS, feature_cols: Sequence[str] = FEATURE_COLS,
+                 season_length: int = 4, ridge: float = 1e-3, batch_size: int = 5000):
+        self.keys = list(keys)
+        self.feature_cols = list(feature_cols)
+        self.season_length = season_length
+        self.ridge = ridge
+        self.batch_size = batch_size
+        self.segments = pd.DataFrame(columns=self.keys)
+        self.hashes: List[str] = []
+        self.profile = np.zeros((0, season_length))
+        self.beta = np.zeros((0, 2 + len(self.feature_cols)))
+        self.n_weeks = np.zeros(0, dtype=np.int64)      # fitted history length per segment
+        self.last_week = np.zeros(0, dtype="datetime64[ns]")
+
+    # --- fitting ---
+    def _features(self, seg_keys: pd.DataFrame, weeks: pd.DatetimeIndex, features: Optional[pd.DataFrame]):
+        n, T = len(seg_keys), len(weeks)
+        out = np.ones((n, T, len(self.feature_cols)))     # 1.0 = neutral factor
+        if features is None or len(features) == 0:
+            return out
+        f = features.copy()
+        f["week"] = _week_start(f["week"]).to_numpy()
+        by = "region" if "region" in f.columns and "region" in seg_keys.columns else None
+        for k, col in enumerate(self.feature_cols):
+            if col not in f.columns:
+                continue
+            if by:
+                table = f.pivot_table(index=by, columns="week", values=col, aggfunc="mean")
+                rows = table.reindex(index=seg_keys[by], columns=weeks).to_numpy(dtype=float)
+            else:
+                series = f.groupby("week")[col].mean().reindex(weeks)
+                rows = np.broadcast_to(series.to_numpy(dtype=float), (n, T))
+            out[:, :, k] = np.where(np.isnan(rows), 1.0, rows)
+        return out
+
+    def _row_features(self, df: pd.DataFrame, features: Optional[pd.DataFrame]) -> np.ndarray:
+        """Feature values (rows x feature_cols) at each rental row's week, as `_features` would give them."""
+        out = np.ones((len(df), len(self.feature_cols)))
+        if features is None or len(features) == 0:
+            return out
+        f = features.copy()
+        f["week"] = _week_start(f["week"]).to_numpy()
+        by = ["week", "region"] if "region" in f.columns and "region" in df.columns else ["week"]
+        where = pd.MultiIndex.from_arrays([df[c].astype(object) if c != "week" else df[c] for c in by])
+        for k, col in enumerate(self.feature_cols):
+            if col in f.columns:
+                table = f.groupby(by)[col].mean()
+                rows = table.reindex(where if len(by) > 1 else where.get_level_values(0)).to_numpy(dtype=float)
+                out[:, k] = np.where(np.isnan(rows), 1.0, rows)
+        return out
+
+    def fit(self, rentals: pd.DataFrame, features: Optional[pd.DataFrame] = None) -> int:
+        """
+        rentals: start_date, rental_days and the segment key columns.
+        features: week, [region], demand_factor ... (weekly; missing weeks count as 1.0).
+        Returns the number of segments (re)fitted.
+        """
+        df = rentals.copy()
+        for k in self.keys:
+            if k not in df.columns:
+                df[k] = "all"
+        if "start_date" not in df.columns:
+            raise KeyError("rentals must have a 'start_date' column for time-series forecasting")
+        df["week"] = _week_start(df["start_date"]).to_numpy()
+
+        grouped = df.groupby(self.keys, observed=True, sort=True)
+        seg_keys = grouped.size().index.to_frame(index=False)
+        seg = grouped.ngroup().to_numpy()
+        weeks = pd.date_range(df["week"].min(), df["week"].max(), freq="W-MON")
+        week_idx = ((df["week"] - weeks[0]).dt.days // 7).to_numpy()
+        days = df["rental_days"].to_numpy(dtype=np.int64)
+
+        n_seg, T = len(seg_keys), len(weeks)
+        hashes = _segment_hashes(seg, df["week"].to_numpy(dtype="datetime64[ns]").view(np.int64), days,
+                                 self._row_features(df, features), n_seg)
+        known = dict(zip(self.segments.itertuples(index=False, name=None), self.hashes))
+        stale = np.array([known.get(key) != h for key, h in zip(seg_keys.itertuples(index=False, name=None), hashes)])
+
+        profile = np.zeros((n_seg, self.season_length))
+        beta = np.zeros((n_seg, 2 + len(self.feature_cols)))
+        n_weeks = np.full(n_seg, T, dtype=np.int64)
+        last_week = np.full(n_seg, weeks[-1].to_datetime64())
+
+        # carry over unchanged segments
+        if len(self.hashes):
+            prev = {key: i for i, key in enumerate(self.segments.itertuples(index=False, name=None))}
+            for i, key in enumerate(seg_keys.itertuples(index=False, name=None)):
+                if not stale[i]:
+                    j = prev[key]
+                    profile[i], beta[i] = self.profile[j], self.beta[j]
+                    n_weeks[i], last_week[i] = self.n_weeks[j], self.last_week[j]
+
+        todo = np.flatnonzero(stale)
+        for start in range(0, len(todo), self.batch_size):
+            rows = todo[start:start + self.batch_size]
+            Y = np.zeros((len(rows), T))
+            mask = np.isin(seg, rows)
+            local = np.searchsorted(rows, seg[mask])
+            np.add.at(Y, (local, week_idx[mask]), days[mask])
+            F = self._features(seg_keys.iloc[rows].reset_index(drop=True), weeks, features)
+            profile[rows], beta[rows] = _fit_batch(Y, F, self.season_length, self.ridge)
+
+        self.segments, self.hashes = seg_keys, hashes
+        self.profile, self.beta, self.n_weeks, self.last_week = profile, beta, n_weeks, last_week
+        return len(todo)
+
+    # --- forecasting ---
+    def predict(self, horizon: int = 4, features: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Forecast `horizon` weeks past each segment's last fitted week."""
+        n = len(self.segments)
+        steps = np.arange(1, horizon + 1)
+        t = (self.n_weeks - 1)[:, None] + steps[None, :]                       # (n, H)
+        week = self.last_week[:, None] + (steps * np.timedelta64(7, "D"))[None, :]
+
+        F = np.ones((n, horizon, len(self.feature_cols)))
+        if features is not None and len(features):
+            # segments may end on different weeks, so look features up per target week
+            grid = pd.DatetimeIndex(np.unique(week))
+            Fg = self._features(self.segments, grid, features)
+            F = Fg[np.arange(n)[:, None], grid.get_indexer(week.ravel()).reshape(n, horizon)]
+
+        seasonal = np.take_along_axis(self.profile, t % self.season_length, axis=1)
+        reg = np.einsum("nhp,np->nh", _design(t, F), self.beta)
+        forecast = np.clip(seasonal + reg, 0, None)
+
+        out = self.segments.loc[self.segments.index.repeat(horizon)].reset_index(drop=True)
+        out["week"] = week.ravel()
+        out["demand_forecast_days"] = forecast.ravel().round(2)
+        return out
+
+    # --- persistence ---
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            keys=np.array(self.keys), feature_cols=np.array(self.feature_cols),
+            segments=self.segments.astype(str).to_numpy(dtype=str), hashes=np.array(self.hashes),
+            profile=self.profile, beta=self.beta, n_weeks=self.n_weeks, last_week=self.last_week,
+            settings=np.array([self.season_length, self.ridge, self.batch_size]),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "DemandForecaster":
+        data = np.load(path, allow_pickle=False)
+        season_length, ridge, batch_size = data["settings"].tolist()
+        model = cls(data["keys"].tolist(), data["feature_cols"].tolist(),
+                    int(season_length), float(ridge), int(batch_size))
+        model.segments = pd.DataFrame(data["segments"], columns=model.keys)
+        model.hashes = data["hashes"].tolist()
+        model.profile, model.beta = data["profile"], data["beta"]
+        model.n_weeks, model.last_week = data["n_weeks"], data["last_week"]
+        return model
@@ -0,0 +1,160 @@
+# src/instrumentation.py
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+def size_of(value) -> Optional[int]:
+    """Rows / items / bytes of a stage result, when it has a length."""
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class Tracer:
+    """
+    Timing spans around the stages of a dashboard refresh.
+
+    `span` (context manager) and `traced` (decorator) record duration and result
+    size per stage. Spans opened between `begin_refresh` and `end_refresh` on the
+    same thread belong to that refresh; spans on other threads (background jobs)
+    go to a separate log. Per-stage call counts and totals cover both. A
+    refresh started with `profile=True` also runs each of its outermost spans
+    under cProfile and keeps the top functions; only that thread is profiled,
+    so other sessions and background jobs are timed but never slowed down.
+    """
+
+    def __init__(self, keep_refreshes: int = 20, keep_background: int = 100, profile_lines: int = 15):
+        self.profile_lines = profile_lines
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.refreshes: deque = deque(maxlen=keep_refreshes)
+        self.background: deque = deque(maxlen=keep_background)
+        self.totals: Dict[str, Dict[str, float]] = {}
+
+    # --- refresh boundaries ---
+    def begin_refresh(self, label: str = "refresh", profile: bool = False):
+        self._local.refresh = {"label": label, "started": time.time(), "spans": []}
+        self._local.profile = profile
+        self._local.t0 = time.perf_counter()
+
+    def end_refresh(self) -> Optional[dict]:
+        refresh = getattr(self._local, "refresh", None)
+        if refresh is None:
+            return None
+        refresh["seconds"] = round(time.perf_counter() - self._local.t0, 6)
+        self._local.refresh = None
+        self._local.profile = False
+        with self._lock:
+            self.refreshes.append(refresh)
+        return refresh
+
+    # --- spans ---
+    @contextmanager
+    def span(self, name: str, size: Optional[int] = None):
+        """
+        Time the enclosed block. Yields a dict; set `rec["size"]` inside the block
+        to record the size of what it produced.
+        """
+        depth = getattr(self._local, "depth", 0)
+        profiler = cProfile.Profile() if getattr(self._local, "profile", False) and depth == 0 else None
+        rec = {"name": name, "size": size, "depth": depth, "thread": threading.current_thread().name}
+        self._local.depth = depth + 1
+        if profiler:
+            try:
+                profiler.enable()
+            except ValueError:
+                # another profiler is active (Python 3.12+ allows only one): time without profiling
+                profiler = None
+                rec["profile"] = "skipped: another profiler is active"
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        except BaseException as exc:
+            rec["error"] = type(exc).__name__
+            raise
+        finally:
+            rec["seconds"] = round(time.perf_counter() - t0, 6)
+            if profiler:
+                profiler.disable()
+                rec["profile"] = self._profile_text(profiler)
+            self._local.depth = depth
+            self._record(rec)
+
+    def traced(self, name: Optional[str] = None, size: Callable = size_of):
+        """Decorator form of `span`; the result size is measured with `size`."""
+        def wrap(fn):
+            label = name or fn.__name__
+
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                with self.span(label) as rec:
+                    out = fn(*args, **kwargs)
+                    rec["size"] = size(out)
+                    return out
+            return inner
+        return wrap
+
+    def _profile_text(self, profiler: cProfile.Profile) -> str:
+        buf = io.StringIO()
+        pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(self.profile_lines)
+        return buf.getvalue()
+
+    def _record(self, rec: dict):
+        refresh = getattr(self._local, "refresh", None)
+        with self._lock:
+            t = self.totals.setdefault(rec["name"], {"calls": 0, "seconds": 0.0, "max_s": 0.0})
+            t["calls"] += 1
+            t["seconds"] += rec["seconds"]
+            t["max_s"] = max(t["max_s"], rec["seconds"])
+            if refresh is not None:
+                refresh["spans"].append(rec)
+            else:
+                self.background.append(rec)
+
+    # --- reporting ---
+    def summary(self) -> List[dict]:
+        """Per-stage calls, total and mean seconds, slowest first."""
+        with self._lock:
+            rows = [{"stage": k, "calls": v["calls"], "total_s": round(v["seconds"], 4),
+                     "mean_s": round(v["seconds"] / v["calls"], 4), "max_s": round(v["max_s"], 4)}
+                    for k, v in self.totals.items()]
+        return sorted(rows, key=lambda r: r["total_s"], reverse=True)
+
+    def export(self, last: Optional[int] = None) -> str:
+        """JSON of the last `last` refreshes (default: all kept), background spans and the summary."""
+        with self._lock:
+            refreshes = list(self.refreshes)[-last:] if last else list(self.refreshes)
+            background = list(self.background)
+        summary = self.summary()
+        return json.dumps({"refreshes": refreshes, "background": background, "summary": summary},
+                          indent=2, default=str)
+
+    def reset(self):
+        with self._lock:
+            self.refreshes.clear()
+            self.background.clear()
+            self.totals.clear()
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer shared by every Streamlit session and the background runner."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+        return _tracer
@@ -0,0 +1,124 @@
+# src/jobs.py
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class JobResult:
+    key: Hashable
+    value: Any
+    finished_at: float
+
+
+class JobRunner:
+    """
+    In-process background worker for slow dashboard computations.
+
+    Work is grouped into named slots ("route", "health", "report", ...). A slot
+    runs at most one job per key at a time, remembers the result for each key
+    it has computed, and keeps the most recent result so the UI can render
+    the last-known value while a newer job is still running. A key whose job
+    raised is not started again until `retry` clears its failure.
+    """
+
+    def __init__(self, max_workers: int = 2, use_processes: bool = False, results_per_slot: int = 32):
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor: Executor = pool(max_workers=max_workers)
+        self.results_per_slot = results_per_slot
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, Hashable], Future] = {}
+        self._results: "OrderedDict[Tuple[str, Hashable], JobResult]" = OrderedDict()
+        self._latest: Dict[str, JobResult] = {}
+        self._errors: Dict[str, BaseException] = {}
+        self._failed: Dict[Tuple[str, Hashable], BaseException] = {}
+
+    def submit(self, slot: str, key: Hashable, fn: Callable, *args, **kwargs) -> Future:
+        """Start fn(*args, **kwargs) for (slot, key) unless it is already running."""
+        with self._lock:
+            fut = self._pending.get((slot, key))
+            if fut is not None:
+                return fut
+            fut = self._executor.submit(fn, *args, **kwargs)
+            self._pending[(slot, key)] = fut
+        fut.add_done_callback(lambda f: self._finish(slot, key, f))
+        return fut
+
+    def _finish(self, slot, key, fut: Future):
+        with self._lock:
+            self._pending.pop((slot, key), None)
+            if fut.cancelled():
+                return
+            err = fut.exception()
+            if err is not None:
+                self._errors[slot] = err
+                self._failed[(slot, key)] = err
+                return
+            res = JobResult(key, fut.result(), time.time())
+            self._results[(slot, key)] = res
+            same_slot = [k for k in self._results if k[0] == slot]
+            for k in same_slot[:len(same_slot) - self.results_per_slot]:
+                del self._results[k]
+            self._latest[slot] = res
+            self._errors.pop(slot, None)
+
+    def get(self, slot: str, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Optional[JobResult], bool]:
+        """
+        Non-blocking lookup. Returns (result, fresh): the result for `key` if it
+        is done (fresh=True); otherwise starts the job and returns the slot's
+        last-known result, possibly None (fresh=False). A key that failed is not
+        resubmitted; check `error` and call `retry` to run it again.
+        """
+        with self._lock:
+            done = self._results.get((slot, key))
+            if done is not None:
+                self._results.move_to_end((slot, key))
+                self._latest[slot] = done
+                return done, True
+            if (slot, key) in self._failed:
+                return self._latest.get(slot), False
+        self.submit(slot, key, fn, *args, **kwargs)
+        with self._lock:
+            return self._latest.get(slot), False
+
+    def pending(self, slot: Optional[str] = None) -> bool:
+        with self._lock:
+            return any(slot is None or s == slot for s, _ in self._pending)
+
+    def error(self, slot: str, key: Optional[Hashable] = None) -> Optional[BaseException]:
+        """Last failure in the slot, or the failure of one key when given."""
+        with self._lock:
+            if key is not None:
+                return self._failed.get((slot, key))
+            return self._errors.get(slot)
+
+    def retry(self, slot: str, key: Hashable):
+        """Forget the failure of (slot, key) so the next `get` starts it again."""
+        with self._lock:
+            self._failed.pop((slot, key), None)
+            self._errors.pop(slot, None)
+
+    def forget(self, slot: str):
+        """Drop the computed results of a slot (e.g. after its inputs changed on disk)."""
+        with self._lock:
+            for k in [k for k in self._results if k[0] == slot]:
+                del self._results[k]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> JobRunner:
+    """Process-wide runner shared by every Streamlit session."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
@@ -1,62 +1,132 @@
 # src/lifecycle.py
+import os
+from dataclasses import dataclass
+from typing import Optional
+
 import pandas as pd
 import numpy as np
 
-def _health_score(usage_hours, move_count, mileage_km):
-    score = 100
-    score -= 0.02 * usage_hours        
-    score -= 0.5  * move_count         
-    score -= 0.01 * mileage_km         
-    return float(np.clip(score, 0, 100))
+from src.data_pipeline import iter_gps_chunks
+
+@dataclass
+class HealthCoefficients:
+    usage_hours: float = 0.02       # score lost per usage hour
+    move_count: float = 0.5         # per move
+    mileage_km: float = 0.01        # per km
+    rul_horizon_days: int = 365     # RUL at a perfect score
+
+# (lower bound exclusive, recommendation); anything not above the last bound falls through
+RECOMMENDATION_BANDS = [
+    (80, "✅ Continue using"),
+    (60, "🔧 Schedule maintenance"),
+    (40, "🔧 Refurbish soon"),
+]
+DEFAULT_RECOMMENDATION = "♻️ Recycle/Decommission"
+
+def recommend(health_score) -> np.ndarray:
+    h = np.asarray(health_score)
+    return np.select([h > bound for bound, _ in RECOMMENDATION_BANDS],
+                     [label for _, label in RECOMMENDATION_BANDS],
+                     default=DEFAULT_RECOMMENDATION)
+
+def health_scores(usage_hours, move_count, mileage_km,
+                  coeffs: Optional[HealthCoefficients] = None):
+    """Array-in, array-out health score (0~100) and RUL in days."""
+    coeffs = coeffs or HealthCoefficients()
+    score = (100.0
+             - coeffs.usage_hours * np.asarray(usage_hours, dtype=float)
+             - coeffs.move_count  * np.asarray(move_count, dtype=float)
+             - coeffs.mileage_km  * np.asarray(mileage_km, dtype=float))
+    score = np.clip(score, 0, 100)
+    rul = np.rint(score / 100.0 * coeffs.rul_horizon_days).astype(np.int64)
+    return score, rul
+
+def score_fleet(df: pd.DataFrame, coeffs: Optional[HealthCoefficients] = None) -> pd.DataFrame:
+    """
+    Add health_score, RUL_days and recommendation to a frame with
+    usage_hours, move_count and mileage_km, in whole-column array operations.
+    """
+    score, rul = health_scores(df["usage_hours"], df["move_count"], df["mileage_km"], coeffs)
+
+    out = df.copy()
+    out["health_score"] = score
+    out["RUL_days"] = rul
+    out["recommendation"] = recommend(score)
+    return out
+
+def load_latest_mileage(path="data/gps_data.csv", equipment_ids=None) -> pd.DataFrame:
+    """
+    Highest odometer reading per equipment from a GPS CSV or columnar dataset,
+    parsing only equipment_id / mileage_km. With a dataset, `equipment_ids`
+    is pushed down so other equipment's partitions are never read. Ids are
+    compared in canonical form, so "EQT007" selects equipment 7.
+    """
+    filters = None
+    if equipment_ids is not None and os.path.isdir(path):
+        from src.columnar_store import equipment_filter
+        filters = equipment_filter(_merge_key(equipment_ids).tolist())
 
-def _estimate_rul_days(health_score):
-    return int(round((health_score / 100.0) * 365))
+    parts = [chunk.groupby("equipment_id")["mileage_km"].max()
+             for chunk in iter_gps_chunks(path, columns=["equipment_id", "mileage_km"], filters=filters)]
+    if not parts:
+        return pd.DataFrame({"equipment_id": [], "mileage_km": []})
+    latest = pd.concat(parts).groupby(level=0).max().reset_index()
+    if equipment_ids is not None and filters is None:
+        latest = latest[_merge_key(latest["equipment_id"]).isin(_merge_key(equipment_ids))].reset_index(drop=True)
+    return latest
 
-def check_equipment_health(usage_path=None, gps=None):
+def _merge_key(ids) -> pd.Series:
+    """Canonical integer ids where every id is int / EQT-numbered, else the ids as strings."""
+    from src.asset_registry import normalize_ids
+    ids = pd.Series(ids)
+    try:
+        return pd.Series(normalize_ids(ids), index=ids.index)
+    except ValueError:
+        return ids.astype(str)
+
+def mock_usage(n=10, seed=42) -> pd.DataFrame:
+    """Stand-in usage totals (equipment_id, usage_hours, move_count) for EQT001..n."""
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    return pd.DataFrame({
+        "equipment_id": [f"EQT{i:03d}" for i in range(1, n + 1)],
+        "usage_hours":  rng.integers(100, 4000, n),
+        "move_count":   rng.integers(5, 120, n),
+    })
+
+def check_equipment_health(usage_path=None, gps=None, coeffs: Optional[HealthCoefficients] = None, seed=42):
+    rng = np.random.default_rng(seed)      # mock usage / mileage fallbacks are reproducible
     try:
         usage = pd.read_csv(usage_path)  # columns: equipment_id, usage_hours, move_count
     except Exception:
         # fallback 
-        usage = pd.DataFrame({
-            "equipment_id": [f"EQT{i:03d}" for i in range(1, 11)],
-            "usage_hours":  np.random.randint(100, 4000, 10),
-            "move_count":   np.random.randint(5, 120, 10),
-        })
+        usage = mock_usage(10, rng)
 
     try:
+        if isinstance(gps, str):
+            gps = load_latest_mileage(gps, _merge_key(usage["equipment_id"]))
         if gps is None or "equipment_id" not in gps.columns:
             total_km = 1000
             if gps is not None and "mileage_km" in gps.columns:
                 total_km = int(gps["mileage_km"].iloc[-1])
             gps = pd.DataFrame({
                 "equipment_id": usage["equipment_id"],
-                "mileage_km": np.random.randint(200, 20000, len(usage)) if gps is None else total_km
+                "mileage_km": rng.integers(200, 20000, len(usage)) if gps is None else total_km
             })
         else:
             gps = gps[["equipment_id","mileage_km"]].groupby("equipment_id", as_index=False).max()
-    except Exception:
+    except (OSError, KeyError):
+        # no GPS file or no mileage in it: mock mileage; unparseable ids are an error, not a fallback
         gps = pd.DataFrame({
             "equipment_id": usage["equipment_id"],
-            "mileage_km": np.random.randint(200, 20000, len(usage))
+            "mileage_km": rng.integers(200, 20000, len(usage))
         })
 
-    # merge usage + gps
-    df = usage.merge(gps, on="equipment_id", how="left")
-    df["mileage_km"].fillna(df["mileage_km"].median(), inplace=True)
-
-    # health score & RUL
-    df["health_score"] = df.apply(
-        lambda r: _health_score(r["usage_hours"], r["move_count"], r["mileage_km"]), axis=1
-    )
-    df["RUL_days"] = df["health_score"].apply(_estimate_rul_days)
-
-    # recommendation
-    def _recommend(h):
-        if h > 80:  return "✅ Continue using"
-        if h > 60:  return "🔧 Schedule maintenance"
-        if h > 40:  return "🔧 Refurbish soon"
-        return "♻️ Recycle/Decommission"
+    # merge usage + gps on canonical ids: usage says "EQT001" where the GPS trace says 1
+    df = usage.assign(_key=_merge_key(usage["equipment_id"])).merge(
+        gps.drop(columns="equipment_id").assign(_key=_merge_key(gps["equipment_id"])), on="_key", how="left")
+    df["mileage_km"] = df["mileage_km"].fillna(df["mileage_km"].median())
 
-    df["recommendation"] = df["health_score"].apply(_recommend)
+    # health score, RUL & recommendation
+    df = score_fleet(df, coeffs)
 
     return df[["equipment_id","usage_hours","move_count","mileage_km","health_score","RUL_days","recommendation"]]
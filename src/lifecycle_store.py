@@ -0,0 +1,207 @@
+# src/lifecycle_store.py
+from dataclasses import asdict, fields
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .asset_registry import normalize_ids
+from .lifecycle import HealthCoefficients, health_scores, recommend
+
+COLUMNS = ["equipment_id", "usage_hours", "move_count", "mileage_km",
+           "health_score", "RUL_days", "recommendation"]
+LOG_VERSIONS = 256      # ingests whose touched rows are kept for changed_since / fleet_health
+
+
+def _canonical_ids(ids) -> list:
+    """Ids as canonical ints (7, "7", "EQT007" -> 7); ids that are not EQT-numbered stay strings."""
+    ids = list(ids)
+    try:
+        return normalize_ids(pd.Series(ids, dtype=object)).tolist()
+    except ValueError:
+        out = []
+        for i in ids:
+            try:
+                out.append(int(normalize_ids([i])[0]))
+            except ValueError:
+                out.append(str(i))
+        return out
+
+
+def _npz(path: str) -> str:
+    # np.savez_compressed appends .npz to a bare path; load must look in the same place
+    return path if path.endswith(".npz") else path + ".npz"
+
+
+class LifecycleStore:
+    """
+    Per-equipment lifecycle state updated from usage / GPS deltas.
+
+    State is held in growable NumPy arrays addressed through a canonical
+    equipment_id -> row dict ("EQT001" and 1 are the same asset), so an ingest
+    only rescores the rows it touched. Every ingest bumps `version` and logs
+    its rows; `changed_since(v)` and `fleet_health()` work from that log, so
+    both cost O(changed rows) rather than O(fleet).
+    """
+
+    def __init__(self, coeffs: Optional[HealthCoefficients] = None, capacity: int = 1024):
+        self.coeffs = coeffs or HealthCoefficients()
+        self.version = 0
+        self._log: List[Tuple[int, np.ndarray]] = []   # (version, rows touched by that ingest)
+        self._log_from = 0                              # changes after this version are all logged
+        self._row: Dict[object, int] = {}
+        self._ids = np.empty(capacity, dtype=object)
+        self._usage = np.zeros(capacity)
+        self._moves = np.zeros(capacity, dtype=np.int64)
+        self._km = np.zeros(capacity)
+        self._score = np.zeros(capacity)
+        self._rul = np.zeros(capacity, dtype=np.int64)
+        self._updated = np.zeros(capacity, dtype=np.int64)
+        self._frame: Optional[pd.DataFrame] = None
+        self._frame_version = -1
+
+    def __len__(self):
+        return len(self._row)
+
+    # --- internals ---
+    def _grow(self, needed: int):
+        cap = len(self._ids)
+        if needed <= cap:
+            return
+        new_cap = max(needed, cap * 2)
+        for name in ("_ids", "_usage", "_moves", "_km", "_score", "_rul", "_updated"):
+            old = getattr(self, name)
+            arr = np.zeros(new_cap, dtype=old.dtype) if old.dtype != object else np.empty(new_cap, dtype=object)
+            arr[:cap] = old
+            setattr(self, name, arr)
+
+    def _rows_for(self, ids: Iterable) -> np.ndarray:
+        ids = _canonical_ids(ids)
+        new = [i for i in dict.fromkeys(ids) if i not in self._row]
+        if new:
+            start = len(self._row)
+            self._grow(start + len(new))
+            for k, eid in enumerate(new):
+                self._row[eid] = start + k
+                self._ids[start + k] = eid
+        return np.fromiter((self._row[i] for i in ids), dtype=np.int64, count=len(ids))
+
+    def _rescore(self, rows: np.ndarray):
+        rows = np.unique(rows)
+        self.version += 1
+        self._score[rows], self._rul[rows] = health_scores(
+            self._usage[rows], self._moves[rows], self._km[rows], self.coeffs)
+        self._updated[rows] = self.version
+        self._log.append((self.version, rows))
+        if len(self._log) > LOG_VERSIONS:
+            self._log_from = self._log.pop(0)[0]
+
+    def _rows_changed(self, version: int) -> Optional[np.ndarray]:
+        """Rows updated after `version` from the log; None when the log no longer reaches back that far."""
+        if version < self._log_from:
+            return None
+        parts = [rows for v, rows in reversed(self._log) if v > version] if version < self.version else []
+        return np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    # --- ingestion ---
+    def ingest_usage(self, events: pd.DataFrame):
+        """Add usage deltas: columns equipment_id, usage_hours, move_count (increments)."""
+        if len(events) == 0:
+            return
+        delta = events.groupby("equipment_id", sort=False)[["usage_hours", "move_count"]].sum()
+        rows = self._rows_for(delta.index)
+        self._usage[rows] += delta["usage_hours"].to_numpy(dtype=float)
+        self._moves[rows] += delta["move_count"].to_numpy(dtype=np.int64)
+        self._rescore(rows)
+
+    def ingest_gps(self, events: pd.DataFrame):
+        """Apply odometer readings: columns equipment_id, mileage_km (cumulative; max wins)."""
+        if len(events) == 0:
+            return
+        latest = events.groupby("equipment_id", sort=False)["mileage_km"].max()
+        rows = self._rows_for(latest.index)
+        self._km[rows] = np.maximum(self._km[rows], latest.to_numpy(dtype=float))
+        self._rescore(rows)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, coeffs: Optional[HealthCoefficients] = None) -> "LifecycleStore":
+        """Bulk-load from a frame shaped like check_equipment_health's input/output."""
+        store = cls(coeffs, capacity=max(len(df), 1))
+        rows = store._rows_for(df["equipment_id"])
+        store._usage[rows] = df["usage_hours"].to_numpy(dtype=float)
+        store._moves[rows] = df["move_count"].to_numpy(dtype=np.int64)
+        store._km[rows] = df["mileage_km"].to_numpy(dtype=float)
+        store._rescore(rows)
+        return store
+
+    # --- queries ---
+    def _frame_for(self, rows: np.ndarray) -> pd.DataFrame:
+        score = self._score[rows]
+        return pd.DataFrame({
+            "equipment_id": self._ids[rows],
+            "usage_hours": self._usage[rows],
+            "move_count": self._moves[rows],
+            "mileage_km": self._km[rows],
+            "health_score": score,
+            "RUL_days": self._rul[rows],
+            "recommendation": recommend(score),
+        }, columns=COLUMNS)
+
+    def get(self, equipment_id) -> dict:
+        row = self._row[_canonical_ids([equipment_id])[0]]
+        return self._frame_for(np.array([row])).iloc[0].to_dict()
+
+    def changed_since(self, version: int) -> pd.DataFrame:
+        rows = self._rows_changed(version)
+        if rows is None:                        # older than the log: fall back to a scan
+            rows = np.flatnonzero(self._updated[:len(self._row)] > version)
+        return self._frame_for(rows)
+
+    def fleet_health(self) -> pd.DataFrame:
+        """
+        Frame of every asset, row i = store row i. Later calls patch only the
+        rows changed since, in place; copy the result to keep a snapshot.
+        """
+        if self._frame_version == self.version:
+            return self._frame
+        rows = None if self._frame is None else self._rows_changed(self._frame_version)
+        if rows is None:
+            self._frame = self._frame_for(np.arange(len(self._row)))
+        else:
+            known = len(self._frame)
+            old, new = rows[rows < known], np.arange(known, len(self._row))
+            if len(old):
+                patch = self._frame_for(old)
+                for j, col in enumerate(COLUMNS):
+                    self._frame.iloc[old, j] = patch[col].to_numpy()
+            if len(new):
+                self._frame = pd.concat([self._frame, self._frame_for(new).set_axis(new)])
+        self._frame_version = self.version
+        return self._frame
+
+    # --- persistence ---
+    def save(self, path: str):
+        n = len(self._row)
+        np.savez_compressed(
+            _npz(path),
+            ids=np.array(self._ids[:n], dtype=str),
+            id_is_int=np.array([isinstance(i, (int, np.integer)) for i in self._ids[:n]]),
+            usage=self._usage[:n], moves=self._moves[:n], km=self._km[:n],
+            score=self._score[:n], rul=self._rul[:n], updated=self._updated[:n],
+            version=self.version, coeffs=np.array(list(asdict(self.coeffs).values())),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LifecycleStore":
+        with np.load(_npz(path), allow_pickle=False) as data:
+            # the snapshot stores coefficients as one float array; restore each field's own type
+            coeffs = HealthCoefficients(*(type(f.default)(v) for f, v in
+                                          zip(fields(HealthCoefficients), data["coeffs"].tolist())))
+            n = len(data["ids"])
+            store = cls(coeffs, capacity=max(n, 1))
+            ids = [int(i) if is_int else str(i) for i, is_int in zip(data["ids"], data["id_is_int"])]
+            store._rows_for(ids)
+            store._usage[:n], store._moves[:n], store._km[:n] = data["usage"], data["moves"], data["km"]
+            store._score[:n], store._rul[:n], store._updated[:n] = data["score"], data["rul"], data["updated"]
+            store.version = store._log_from = int(data["version"])
+        return store
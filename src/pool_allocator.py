@@ -0,0 +1,194 @@
+# src/pool_allocator.py
+import threading
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.spatial_index import SpatialIndex
+
+AVAILABLE = "Available"
+ALLOCATED = "In Use"
+
+
+class PoolAllocator:
+    """
+    Cross-company equipment pool that hands out units to rental requests.
+
+    Units live in typed arrays (type / company / status codes, position)
+    addressed by row. Available units are indexed by (type, company): a set of
+    rows for O(1) pops, plus a spatial index over the positioned ones so a
+    request with a delivery location gets its nearest units. Requests in a
+    batch are served in order and each one sees the previous assignments; one
+    lock covers every read and write, so concurrent batches never hand out the
+    same unit twice.
+    """
+
+    def __init__(self, pool: pd.DataFrame, positions: Optional[SpatialIndex] = None, cell_km: float = 25.0):
+        self.cell_km = cell_km
+        self._lock = threading.Lock()
+        self._ids = pool["equipment_id"].to_numpy(dtype=object)
+        self._row = {eid: i for i, eid in enumerate(self._ids)}
+        if len(self._row) != len(self._ids):
+            raise ValueError("equipment_id must be unique in the pool")
+        self._type_code, self.types = pd.factorize(pool["equipment_type"])
+        self._company_code, self.companies = pd.factorize(pool["company"])
+        self.statuses = list(dict.fromkeys([AVAILABLE, ALLOCATED, *pool["status"].unique()]))
+        self._status = np.array([self.statuses.index(s) for s in pool["status"]], dtype=np.int16)
+        self._type_of = {t: i for i, t in enumerate(self.types)}
+        self._company_of = {c: i for i, c in enumerate(self.companies)}
+
+        self._lat = np.full(len(pool), np.nan)
+        self._lon = np.full(len(pool), np.nan)
+        if {"lat", "lon"} <= set(pool.columns):
+            self._lat[:] = pool["lat"].to_numpy(dtype=float)
+            self._lon[:] = pool["lon"].to_numpy(dtype=float)
+        elif positions is not None:
+            for i, eid in enumerate(self._ids):
+                if eid in positions:
+                    self._lat[i], self._lon[i] = positions.position(eid)
+
+        self._free: Dict[Tuple[int, int], Set[int]] = {}
+        self._near: Dict[Tuple[int, int], SpatialIndex] = {}
+        self._index(np.flatnonzero(self._status == 0))
+
+    def __len__(self):
+        return len(self._ids)
+
+    # --- availability index (callers hold the lock) ---
+    def _index(self, rows: np.ndarray):
+        keys = self._type_code[rows].astype(np.int64) * (1 << 32) + self._company_code[rows]
+        for key in np.unique(keys):
+            group = rows[keys == key]
+            k = (int(key >> 32), int(key & 0xFFFFFFFF))
+            self._free.setdefault(k, set()).update(group.tolist())
+            placed = group[~np.isnan(self._lat[group])]
+            if len(placed):
+                index = self._near.setdefault(k, SpatialIndex(self.cell_km))
+                index.update(placed.tolist(), self._lat[placed], self._lon[placed])
+
+    def _unindex(self, rows: Iterable[int]):
+        for row in rows:
+            k = (int(self._type_code[row]), int(self._company_code[row]))
+            self._free[k].discard(row)
+            if k in self._near:
+                self._near[k].remove([row])
+
+    def _take(self, type_code: int, companies: List[int], need: int, lat, lon) -> List[Tuple[int, float]]:
+        keys = [(type_code, c) for c in companies if self._free.get((type_code, c))]
+        picked: List[Tuple[int, float]] = []
+        if lat is not None and not pd.isna(lat):
+            near = [self._near[k].nearest_ids(lat, lon, need) for k in keys if k in self._near]
+            if near:
+                rows = np.concatenate([r for r, _ in near]).astype(np.int64)
+                dist = np.concatenate([d for _, d in near])
+                best = np.argsort(dist, kind="stable")[:need]
+                picked = list(zip(rows[best].tolist(), dist[best].tolist()))
+        if len(picked) < need:
+            taken = {row for row, _ in picked}
+            for k in keys:
+                rest = (row for row in self._free[k] if row not in taken)
+                picked += [(row, np.nan) for row in islice(rest, need - len(picked))]
+                if len(picked) >= need:
+                    break
+        rows = [row for row, _ in picked]
+        self._unindex(rows)
+        self._status[rows] = 1
+        return picked
+
+    # --- allocation ---
+    def allocate(self, requests: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Serve a batch of requests: columns equipment_type and optionally request_id,
+        quantity (default 1), company (restrict to one owner), lat / lon (delivery
+        point; nearest units first). Returns (assignments, shortfall): one row per
+        assigned unit with its distance_km (NaN when either side has no position),
+        and the requests that could not be filled completely.
+        """
+        n = len(requests)
+
+        def column(name, default):
+            return requests[name].tolist() if name in requests.columns else [default] * n
+
+        req_ids = column("request_id", None) if "request_id" in requests.columns else list(range(n))
+        # blank / unparseable quantities in a request CSV mean one unit
+        qty = (pd.to_numeric(requests["quantity"], errors="coerce").fillna(1).astype(int).tolist()
+               if "quantity" in requests.columns else [1] * n)
+        company = column("company", None)
+        lat, lon = column("lat", None), column("lon", None)
+        everyone = list(range(len(self.companies)))
+
+        out_req, out_row, out_dist, short = [], [], [], []
+        with self._lock:
+            for i, etype in enumerate(requests["equipment_type"].tolist()):
+                need = qty[i]
+                t = self._type_of.get(etype)
+                c = company[i]
+                owners = everyone if c is None or pd.isna(c) else [self._company_of.get(c, -1)]
+                picked = self._take(t, owners, need, lat[i], lon[i]) if t is not None else []
+                out_req += [req_ids[i]] * len(picked)
+                out_row += [row for row, _ in picked]
+                out_dist += [d for _, d in picked]
+                if len(picked) < need:
+                    short.append((req_ids[i], etype, need, len(picked)))
+
+        rows = np.array(out_row, dtype=np.int64)
+        assignments = pd.DataFrame({
+            "request_id": out_req,
+            "equipment_id": self._ids[rows],
+            "company": self.companies[self._company_code[rows]] if len(rows) else [],
+            "equipment_type": self.types[self._type_code[rows]] if len(rows) else [],
+            "distance_km": np.round(np.array(out_dist, dtype=float), 2),
+        })
+        shortfall = pd.DataFrame(short, columns=["request_id", "equipment_type", "requested", "assigned"])
+        return assignments, shortfall
+
+    def set_status(self, equipment_ids: Iterable, status: str) -> int:
+        """Move units to `status` (e.g. "Maintenance"); "Available" returns them to the pool."""
+        rows = np.fromiter((self._row[e] for e in equipment_ids), dtype=np.int64)
+        with self._lock:
+            if status not in self.statuses:
+                self.statuses.append(status)
+            code = self.statuses.index(status)
+            was_free = rows[self._status[rows] == 0]
+            self._unindex(was_free.tolist())
+            self._status[rows] = code
+            if code == 0:
+                self._index(rows)
+        return len(rows)
+
+    def release(self, equipment_ids: Iterable) -> int:
+        return self.set_status(equipment_ids, AVAILABLE)
+
+    def move(self, equipment_ids: Iterable, lat, lon):
+        """Update unit positions (e.g. from new GPS pings)."""
+        rows = np.fromiter((self._row[e] for e in equipment_ids), dtype=np.int64)
+        with self._lock:
+            free = rows[self._status[rows] == 0]
+            self._unindex(free.tolist())
+            self._lat[rows], self._lon[rows] = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+            self._index(free)
+
+    # --- views ---
+    def available(self, equipment_type: str, company: Optional[str] = None) -> int:
+        t = self._type_of.get(equipment_type)
+        with self._lock:
+            if company is not None:
+                return len(self._free.get((t, self._company_of.get(company)), ()))
+            return sum(len(v) for (tt, _), v in self._free.items() if tt == t)
+
+    def frame(self) -> pd.DataFrame:
+        """Current pool in the generate_shared_pool schema."""
+        with self._lock:
+            status = np.array(self.statuses, dtype=object)[self._status]
+        return pd.DataFrame({
+            "equipment_id": self._ids,
+            "company": self.companies[self._company_code],
+            "equipment_type": self.types[self._type_code],
+            "status": status,
+        })
+
+    def inventory(self) -> pd.DataFrame:
+        """Unit counts per equipment_type x company x status."""
+        return self.frame().groupby(["equipment_type", "company", "status"]).size().rename("units").reset_index()
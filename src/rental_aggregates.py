@@ -0,0 +1,144 @@
+# src/rental_aggregates.py
+import datetime as dt
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data_pipeline import iter_rental_chunks
+
+DEFAULT_DIMS = ("equipment", "project", "region")
+
+
+class _DailyRollup:
+    """Dense (key x day) rental-day sums and counts for one dimension."""
+
+    def __init__(self):
+        self.keys: Dict[object, int] = {}
+        self.days = np.zeros((0, 0), dtype=np.int64)
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+
+    def _grow(self, n_keys: int, n_days: int):
+        k, d = self.days.shape
+        if n_keys <= k and n_days <= d:
+            return
+        shape = (max(n_keys, k * 2 if n_keys > k else k), max(n_days, d * 2 if n_days > d else d))
+        for name in ("days", "counts"):
+            arr = np.zeros(shape, dtype=np.int64)
+            arr[:k, :d] = getattr(self, name)
+            setattr(self, name, arr)
+
+    def add(self, values: pd.Series, day_idx: np.ndarray, rental_days: np.ndarray):
+        codes, uniques = pd.factorize(values)
+        key_idx = np.empty(len(uniques), dtype=np.int64)
+        for i, key in enumerate(uniques):
+            key_idx[i] = self.keys.setdefault(key, len(self.keys))
+        known = codes >= 0                     # a blank key (code -1) books under no group
+        rows = key_idx[codes[known]]
+        self._grow(len(self.keys), int(day_idx.max()) + 1)
+        np.add.at(self.days, (rows, day_idx[known]), np.asarray(rental_days)[known])
+        np.add.at(self.counts, (rows, day_idx[known]), 1)
+
+
+class RentalAggregateStore:
+    """
+    Materialized per-day rollups of rental history by equipment / project / region.
+
+    `append` touches only the new rows (one scatter-add per dimension), and
+    totals, daily series and rolling windows are answered from the rollups,
+    never from raw history. Records without a start_date are filed under the
+    day they were ingested; a blank equipment / project / region leaves the
+    record out of that dimension's rollup only.
+    """
+
+    def __init__(self, dims: Sequence[str] = DEFAULT_DIMS, origin: str = "2020-01-01"):
+        self.dims = list(dims)
+        self.origin = pd.Timestamp(origin)
+        self.rollups: Dict[str, _DailyRollup] = {}
+        self.rows_ingested = 0
+        self.last_day = -1
+
+    def _day_index(self, df: pd.DataFrame) -> np.ndarray:
+        if "start_date" in df.columns:
+            dates = pd.to_datetime(df["start_date"])
+        else:
+            dates = pd.Series(pd.Timestamp(dt.date.today()), index=df.index)
+        idx = (dates - self.origin).dt.days.to_numpy()
+        if (idx < 0).any():
+            raise ValueError(f"rental start_date before store origin {self.origin.date()}")
+        return idx
+
+    def append(self, rentals: pd.DataFrame) -> int:
+        """Fold new rental records into the rollups; returns rows added."""
+        if len(rentals) == 0:
+            return 0
+        df = rentals.rename(columns=lambda c: c.strip().lower())
+        day_idx = self._day_index(df)
+        rental_days = df["rental_days"].to_numpy(dtype=np.int64)
+        for dim in self.dims:
+            if dim in df.columns:
+                self.rollups.setdefault(dim, _DailyRollup()).add(df[dim], day_idx, rental_days)
+        self.rows_ingested += len(df)
+        self.last_day = max(self.last_day, int(day_idx.max()))
+        return len(df)
+
+    @classmethod
+    def from_file(cls, path="data/rental_history.csv", dims: Sequence[str] = DEFAULT_DIMS, **kwargs):
+        store = cls(dims, **kwargs)
+        for chunk in iter_rental_chunks(path):
+            store.append(chunk)
+        return store
+
+    # --- queries ---
+    def dimension(self, *candidates: str) -> str:
+        """First of `candidates` that has been ingested."""
+        for dim in candidates:
+            if dim in self.rollups:
+                return dim
+        raise KeyError(f"No rollup for any of {candidates}")
+
+    def _slice(self, start, end):
+        lo = 0 if start is None else max((pd.Timestamp(start) - self.origin).days, 0)
+        hi = self.last_day + 1 if end is None else (pd.Timestamp(end) - self.origin).days + 1
+        return slice(lo, max(hi, lo))
+
+    def totals(self, dim: str, start=None, end=None) -> pd.DataFrame:
+        """rental_days and rental count per `dim` value between start and end (inclusive)."""
+        r = self.rollups[dim]
+        span = self._slice(start, end)
+        keys = list(r.keys)
+        n = len(keys)
+        out = pd.DataFrame({
+            dim: keys,
+            "rental_days": r.days[:n, span].sum(axis=1),
+            "rentals": r.counts[:n, span].sum(axis=1),
+        })
+        return out.sort_values(dim, key=lambda s: s.astype(str)).reset_index(drop=True)
+
+    def daily(self, dim: str, start=None, end=None) -> pd.DataFrame:
+        """Long frame of (date, dim, rental_days) for days with rentals."""
+        r = self.rollups[dim]
+        span = self._slice(start, end)
+        block = r.days[:len(r.keys), span]
+        k, d = np.nonzero(block)
+        keys = np.array(list(r.keys), dtype=object)
+        return pd.DataFrame({
+            "date": self.origin + pd.to_timedelta(d + span.start, unit="D"),
+            dim: keys[k],
+            "rental_days": block[k, d],
+        }).sort_values(["date", dim], key=lambda s: s.astype(str)).reset_index(drop=True)
+
+    def rolling(self, dim: str, window_days: int = 28, end=None) -> pd.DataFrame:
+        """Totals over the `window_days` days ending at `end` (default: latest day)."""
+        end_ts = pd.Timestamp(end) if end is not None else self.origin + pd.Timedelta(days=self.last_day)
+        return self.totals(dim, end_ts - pd.Timedelta(days=window_days - 1), end_ts)
+
+    # --- drop-in results for demand_model ---
+    def forecast_demand(self, start=None, end=None) -> pd.DataFrame:
+        dim = self.dimension("equipment", "project")
+        out = self.totals(dim, start, end)[[dim, "rental_days"]]
+        return out.rename(columns={dim: "project", "rental_days": "demand_forecast_days"})
+
+    def region_trend(self, start=None, end=None) -> pd.DataFrame:
+        dim = self.dimension("region", "project")
+        return self.totals(dim, start, end)[[dim, "rental_days"]].rename(columns={"rental_days": "total_days"})
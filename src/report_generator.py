@@ -1,15 +1,78 @@
 # src/report_generator.py
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+# reportlab is imported inside the builders, so importing this module (e.g. for
+# TITLE via src.report_service) stays cheap until a PDF is actually rendered
+from functools import lru_cache
 import io
+import numbers
 
-def generate_report(kpi_data, sustain_data, circular_data):
-    buffer = io.BytesIO()
+TITLE = "RPM Hire – Sustainability Report"
+CIRCULAR_COLUMNS = [("equipment_id", "Equipment"), ("recommendation", "Recommendation"), ("health_score", "Health")]
+CIRCULAR_WIDTHS = [110, 240, 60]
+
+
+@lru_cache(maxsize=1)
+def _styles():
+    from reportlab.lib.styles import getSampleStyleSheet
+    # building the sample stylesheet is a noticeable part of a small report
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=1)
+def _table_style():
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+    return TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0057B8")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#EEF3FA")]),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#B0BCCB")),
+    ])
+
+
+def _metrics_chart(metrics: dict):
+    from reportlab.graphics.charts.barcharts import HorizontalBarChart
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+    numeric = {k: float(v) for k, v in metrics.items() if isinstance(v, numbers.Real) and not isinstance(v, bool)}
+    if not numeric:
+        return None
+    drawing = Drawing(440, 22 * len(numeric) + 20)
+    chart = HorizontalBarChart()
+    chart.x, chart.y = 110, 10
+    chart.width, chart.height = 310, 22 * len(numeric)
+    chart.data = [list(numeric.values())]
+    chart.categoryAxis.categoryNames = list(numeric)
+    chart.categoryAxis.labels.fontSize = 8
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.valueMin = min(0.0, *numeric.values())
+    chart.bars[0].fillColor = colors.HexColor("#0057B8")
+    drawing.add(chart)
+    return drawing
+
+
+def _circular_table(circular_data):
+    from reportlab.platypus import Table
+    rows = [[label for _, label in CIRCULAR_COLUMNS]]
+    rows += [[str(item.get(key, "")) for key, _ in CIRCULAR_COLUMNS] for item in circular_data]
+    table = Table(rows, colWidths=CIRCULAR_WIDTHS, repeatRows=1, hAlign="LEFT")
+    table.setStyle(_table_style())
+    return table
+
+
+def generate_report(kpi_data, sustain_data, circular_data, out=None, title=TITLE):
+    """
+    Build the PDF report. Written to `out` (a path or binary file object) when
+    given; otherwise returned as a BytesIO positioned at the start.
+    """
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    buffer = out if out is not None else io.BytesIO()
     doc = SimpleDocTemplate(buffer)
-    styles = getSampleStyleSheet()
+    styles = _styles()
     story = []
 
-    story.append(Paragraph("RPM Hire – Sustainability Report", styles['Title']))
+    story.append(Paragraph(title, styles['Title']))
     story.append(Spacer(1, 20))
 
     story.append(Paragraph("Key Performance Indicators:", styles['Heading2']))
@@ -20,14 +83,17 @@ def generate_report(kpi_data, sustain_data, circular_data):
     story.append(Paragraph("Sustainability Metrics:", styles['Heading2']))
     for k, v in sustain_data.items():
         story.append(Paragraph(f"{k}: {v}", styles['Normal']))
+    chart = _metrics_chart(sustain_data)
+    if chart is not None:
+        story.append(chart)
     story.append(Spacer(1, 12))
 
     story.append(Paragraph("Circular Economy Recommendations:", styles['Heading2']))
-    for item in circular_data:
-        story.append(Paragraph(f"{item['equipment_id']} – {item['recommendation']} (Health {item['health_score']})", styles['Normal']))
+    if len(circular_data):
+        story.append(_circular_table(circular_data))
     story.append(Spacer(1, 12))
 
     doc.build(story)
-    buffer.seek(0)
+    if out is None:
+        buffer.seek(0)
     return buffer
-
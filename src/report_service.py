@@ -0,0 +1,163 @@
+# src/report_service.py
+import hashlib
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .report_generator import TITLE, generate_report
+
+
+def report_key(kpi_data, sustain_data, circular_data, title=TITLE) -> str:
+    """Hash of everything that ends up in the PDF."""
+    payload = json.dumps([title, kpi_data, sustain_data, list(circular_data)], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _write_atomic(path: str, kpi_data, sustain_data, circular_data, title):
+    # render into a temp file next to the target, then rename: readers never see half a PDF
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            generate_report(kpi_data, sustain_data, circular_data, out=f, title=title)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):                 # only left behind when the render failed
+            os.remove(tmp)
+
+
+@dataclass
+class ReportSpec:
+    name: str                                   # customer / region; used in the file name
+    kpi_data: Dict
+    sustain_data: Dict
+    circular_data: List[Dict] = field(default_factory=list)
+    title: str = TITLE
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(name)).strip("_") or "report"
+
+
+def _render_spec(spec: ReportSpec, directory: str) -> Tuple[str, str, bool]:
+    key = report_key(spec.kpi_data, spec.sustain_data, spec.circular_data, spec.title)
+    path = os.path.join(directory, f"{_safe_name(spec.name)}-{key[:12]}.pdf")
+    if os.path.exists(path):
+        return spec.name, path, False
+    _write_atomic(path, spec.kpi_data, spec.sustain_data, spec.circular_data, spec.title)
+    return spec.name, path, True
+
+
+class ReportService:
+    """
+    PDF reports rendered on demand and cached on disk by input hash.
+
+    `path` / `content` render only when no report for the same inputs exists
+    yet; old files are evicted by mtime beyond `max_entries`. `bulk` renders
+    many reports (one per customer or region) across a process pool, each
+    worker writing its PDF straight to disk so only file paths come back.
+    """
+
+    def __init__(self, directory: str = "data/reports", max_entries: int = 64):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.renders = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _files(self) -> List[str]:
+        return [f for f in os.listdir(self.directory) if f.endswith(".pdf")]
+
+    def path(self, kpi_data, sustain_data, circular_data, title=TITLE) -> str:
+        key = report_key(kpi_data, sustain_data, circular_data, title)
+        path = os.path.join(self.directory, f"{key}.pdf")
+        if os.path.exists(path):
+            os.utime(path)  # mark as recently used
+            self.hits += 1
+            return path
+        _write_atomic(path, kpi_data, sustain_data, circular_data, title)
+        self.renders += 1
+        self._evict()
+        return path
+
+    def content(self, kpi_data, sustain_data, circular_data, title=TITLE) -> bytes:
+        with open(self.path(kpi_data, sustain_data, circular_data, title), "rb") as f:
+            return f.read()
+
+    def _evict(self):
+        files = self._files()
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda name: os.path.getmtime(os.path.join(self.directory, name)))
+        for name in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    @staticmethod
+    def bulk(specs: Iterable[ReportSpec], out_dir: str, max_workers: Optional[int] = None,
+             in_flight: int = 64, errors: Optional[Dict[str, BaseException]] = None
+             ) -> Iterator[Tuple[str, Optional[str], bool]]:
+        """
+        Render every spec into `out_dir` as "<name>-<hash>.pdf" on a process pool.
+        Yields (name, path, rendered) as reports finish; rendered is False when an
+        identical report was already there. A spec that fails to render yields
+        (name, None, False), its exception is stored in `errors` (when given)
+        and the run carries on. At most `in_flight` specs are queued at once, so
+        a large generator of specs is never materialized.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        specs = iter(specs)
+        workers = max_workers or os.cpu_count() or 1
+
+        def outcome(fut, name):
+            try:
+                return fut.result()
+            except Exception as exc:
+                if errors is not None:
+                    errors[name] = exc
+                return name, None, False
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Dict = {}
+            for spec in specs:
+                pending[pool.submit(_render_spec, spec, out_dir)] = spec.name
+                if len(pending) >= in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        yield outcome(fut, pending.pop(fut))
+            for fut in as_completed(pending):
+                yield outcome(fut, pending[fut])
+
+
+_default_service: Optional[ReportService] = None
+
+
+def default_service() -> ReportService:
+    global _default_service
+    if _default_service is None:
+        _default_service = ReportService()
+    return _default_service
+
+
+if __name__ == "__main__":
+    # one report per region from the rental history
+    from .data_context import get_context
+
+    ctx = get_context()
+    sustain = ctx.sustainability()
+    trend = ctx.region_trend()
+    key = trend.columns[0]
+    specs = (ReportSpec(row[key], {"Region": row[key], "Rental days": int(row["total_days"])}, sustain,
+                        title=f"{TITLE} – {row[key]}")
+             for _, row in trend.iterrows())
+    errors: Dict[str, BaseException] = {}
+    for name, path, rendered in ReportService.bulk(specs, "data/reports/regions", errors=errors):
+        if path is None:
+            print(f"{name}: failed ({errors[name]})")
+        else:
+            print(f"{name}: {path}{'' if rendered else ' (unchanged)'}")
@@ -0,0 +1,101 @@
+# src/route_batch.py
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .kpi import KPIWeights, normalize_weights
+from .route_cache import cached_optimize_route
+
+METRIC_KEYS = ("distance_km", "time_hr", "co2_kg", "congestion_index")
+
+
+@dataclass
+class RouteJob:
+    depot: str
+    coords: Optional[List[Tuple[float, float]]] = None     # None = mock nodes
+    weights: KPIWeights = field(default_factory=KPIWeights)
+    options: Dict = field(default_factory=dict)             # extra optimize_route kwargs
+
+
+def _solve_job(job: RouteJob):
+    # workers share the on-disk cache, so repeated sweeps (or a server restart) skip solved jobs
+    route, metrics = cached_optimize_route(
+        use_mock=job.coords is None, coords=job.coords, weights=job.weights, **job.options
+    )
+    return route, metrics
+
+
+def solve_batch(jobs: Iterable[RouteJob], max_workers: Optional[int] = None) -> Iterator[Tuple[RouteJob, list, dict]]:
+    """
+    Solve independent route jobs on a process pool.
+    Yields (job, route, metrics) in completion order, not submission order.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    # callers run this on background threads (src.jobs); forking a threaded
+    # process can deadlock the child, so workers start from a clean interpreter
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as pool:
+        futures = {pool.submit(_solve_job, job): job for job in jobs}
+        for fut in as_completed(futures):
+            route, metrics = fut.result()
+            yield futures[fut], route, metrics
+
+
+def _weight_grid(resolution: int) -> List[KPIWeights]:
+    # every point on the normalized-weight simplex with step 1/resolution
+    grid = []
+    for d, t, c in itertools.product(range(resolution + 1), repeat=3):
+        g = resolution - d - t - c
+        if g >= 0:
+            grid.append(KPIWeights(d / resolution, t / resolution, c / resolution, g / resolution))
+    return grid
+
+
+def _dominates(a: dict, b: dict) -> bool:
+    return (all(a[k] <= b[k] for k in METRIC_KEYS)
+            and any(a[k] < b[k] for k in METRIC_KEYS))
+
+
+class RouteFrontier:
+    """Precomputed routes over a KPI-weight grid; `lookup` replaces a solve."""
+
+    def __init__(self, results: List[Tuple[KPIWeights, list, dict]]):
+        self.results = results
+        self.pareto = [r for r in results
+                       if not any(_dominates(o[2], r[2]) for o in results)]
+
+    def lookup(self, weights: KPIWeights) -> Tuple[list, dict]:
+        """Route and metrics of the grid point closest to the normalized `weights`."""
+        w = normalize_weights(weights)
+
+        def gap(item):
+            g = item[0]
+            return (abs(g.distance - w.distance) + abs(g.time - w.time)
+                    + abs(g.co2 - w.co2) + abs(g.congestion - w.congestion))
+
+        _, route, metrics = min(self.results, key=gap)
+        return route, metrics
+
+
+def weight_sweep(
+    coords: Optional[List[Tuple[float, float]]] = None,
+    depot: str = "depot",
+    resolution: int = 4,
+    max_workers: Optional[int] = None,
+    **options
+) -> RouteFrontier:
+    """
+    Solve one node set across a grid of KPI weights in parallel.
+    `options` are passed to optimize_route (e.g. time_limit_s=1).
+    """
+    options.setdefault("time_limit_s", 1)
+    jobs = [RouteJob(depot, coords, w, options) for w in _weight_grid(resolution)]
+    results = [(job.weights, route, metrics)
+               for job, route, metrics in solve_batch(jobs, max_workers)]
+    return RouteFrontier(results)
@@ -0,0 +1,177 @@
+# src/route_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import astuple
+from typing import Dict, List, Optional, Tuple
+
+from .kpi import KPIWeights, normalize_weights
+from .route_vrp import NO_ROUTE, _mock_nodes, optimize_route
+
+# optimize_route arguments that change the answer, besides nodes and weights
+SOLVER_KEYS = ("vehicle_count", "emission_factor_kg_per_km", "avg_speed_kmph",
+               "metric", "time_limit_s", "solution_limit")
+
+
+def _digest(obj) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True).encode()).hexdigest()
+
+
+def _weight_vector(weights: KPIWeights) -> List[float]:
+    return [round(x, 6) for x in astuple(normalize_weights(weights))]
+
+
+class RouteCache:
+    """
+    On-disk LRU cache of optimize_route results, one JSON file per entry.
+
+    Entries are named "<node-set hash>-<request hash>.json" so that requests on
+    the same nodes can be found without reading every file; file mtime is the
+    recency used for eviction once `max_entries` is exceeded. The entries are
+    shared through the directory, but the hit / miss counters in `stats` are
+    per process: lookups made in route_batch pool workers count there, not here.
+    """
+
+    def __init__(self, directory: str = "data/route_cache", max_entries: int = 256,
+                 warm_start_tolerance: float = 0.25):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.warm_start_tolerance = warm_start_tolerance
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def count(self, name: str):
+        """Bump one of the hits / misses / warm_starts counters."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {"hits": self.hits, "misses": self.misses, "warm_starts": self.warm_starts}
+        return {**counts, "entries": len(self._files())}
+
+    def _files(self) -> List[str]:
+        return [f for f in os.listdir(self.directory) if f.endswith(".json")]
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def keys(coords, weights: KPIWeights, settings: Dict) -> Tuple[str, str]:
+        nodes = [[round(float(a), 6), round(float(b), 6)] for a, b in coords]
+        node_key = _digest({"nodes": nodes, **settings})[:16]
+        request_key = _digest({"nodes": nodes, "weights": _weight_vector(weights), **settings})[:16]
+        return node_key, request_key
+
+    def get(self, node_key: str, request_key: str) -> Optional[dict]:
+        path = self._path(f"{node_key}-{request_key}.json")
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # mark as recently used
+        return entry
+
+    def nearest(self, node_key: str, weights: KPIWeights) -> Optional[dict]:
+        """Cached entry on the same node set with the closest weights, within tolerance."""
+        target = _weight_vector(weights)
+        best, best_gap = None, self.warm_start_tolerance
+        for name in self._files():
+            if not name.startswith(node_key + "-"):
+                continue
+            try:
+                with open(self._path(name)) as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            gap = sum(abs(a - b) for a, b in zip(entry["weights"], target))
+            if gap <= best_gap:
+                best, best_gap = entry, gap
+        return best
+
+    def put(self, node_key: str, request_key: str, weights: KPIWeights, route, metrics):
+        entry = {"weights": _weight_vector(weights), "route": route, "metrics": metrics}
+        # write-then-rename so concurrent readers (e.g. pool workers) never see half a file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(f"{node_key}-{request_key}.json"))
+        finally:
+            if os.path.exists(tmp):             # only left behind when the write failed
+                os.remove(tmp)
+        self._evict()
+
+    def _evict(self):
+        files = self._files()
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda name: os.path.getmtime(self._path(name)))
+        for name in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    def clear(self):
+        for name in self._files():
+            os.remove(self._path(name))
+        with self._lock:
+            self.hits = self.misses = self.warm_starts = 0
+
+
+_default_cache: Optional[RouteCache] = None
+
+
+def default_cache() -> RouteCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RouteCache()
+    return _default_cache
+
+
+def cached_optimize_route(
+    use_mock: bool = True,
+    coords: List[Tuple[float, float]] = None,
+    weights: Optional[KPIWeights] = None,
+    cache: RouteCache = None,
+    **kwargs
+):
+    """
+    optimize_route behind a RouteCache; same arguments and return value.
+    Infeasible results are returned but not stored, so a timed-out search is
+    retried on the next call instead of being served from the cache.
+    """
+    cache = cache or default_cache()
+    weights = weights or KPIWeights()
+    if use_mock or coords is None:
+        use_mock, coords = False, _mock_nodes(n_customers=8)
+        kwargs.setdefault("metric", "euclidean")
+
+    settings = {k: kwargs.get(k) for k in SOLVER_KEYS}
+    if kwargs.get("congestion"):
+        # live congestion changes the costs, so it is part of the request key
+        settings["congestion"] = {str(k): round(float(v), 3) for k, v in sorted(kwargs["congestion"].items())}
+    node_key, request_key = cache.keys(coords, weights, settings)
+
+    entry = cache.get(node_key, request_key)
+    if entry is not None:
+        cache.count("hits")
+        return entry["route"], entry["metrics"]
+
+    cache.count("misses")
+    hint = cache.nearest(node_key, weights)
+    if hint is not None:
+        cache.count("warm_starts")
+        kwargs["initial_route"] = hint["route"]
+
+    route, metrics = optimize_route(use_mock=use_mock, coords=coords, weights=weights, **kwargs)
+    if route != [NO_ROUTE]:
+        cache.put(node_key, request_key, weights, route, metrics)
+    return route, metrics
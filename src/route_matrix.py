@@ -0,0 +1,181 @@
+# src/route_matrix.py
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+_CACHE_SIZE = 32
+_matrix_cache: "OrderedDict[tuple, RouteMatrix]" = OrderedDict()
+
+
+def _as_coords(coords) -> np.ndarray:
+    arr = np.array(coords, dtype=np.float64)
+    if arr.ndim != 2 or arr.shape[1] != 2:
+        raise ValueError("coords must be a sequence of (x, y) / (lat, lon) pairs")
+    return arr
+
+
+def _pairwise_distance(a: np.ndarray, b: np.ndarray, metric: str) -> np.ndarray:
+    """Distance (km) between every row of `a` and every row of `b`, shape (len(a), len(b))."""
+    if metric == "euclidean":
+        return np.hypot(a[:, None, 0] - b[None, :, 0], a[:, None, 1] - b[None, :, 1])
+    if metric == "haversine":
+        lat1, lon1 = np.radians(a[:, 0])[:, None], np.radians(a[:, 1])[:, None]
+        lat2, lon2 = np.radians(b[:, 0])[None, :], np.radians(b[:, 1])[None, :]
+        h = (np.sin((lat2 - lat1) / 2) ** 2
+             + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+    raise ValueError(f"Unknown metric: {metric!r} (use 'euclidean' or 'haversine')")
+
+
+def _congestion(n: int, base: float, rng: np.random.Generator) -> np.ndarray:
+    # Off-diagonal cells are filled in row-major order, matching the draw order
+    # of the original nested-loop implementation for the same seed.
+    mat = np.zeros((n, n))
+    off_diag = ~np.eye(n, dtype=bool)
+    mat[off_diag] = np.clip(base + rng.uniform(0, 0.5, n * (n - 1)), 0, 1.0)
+    return mat
+
+
+def _readonly(*arrays):
+    for a in arrays:
+        a.setflags(write=False)
+
+
+class RouteMatrix:
+    """
+    Distance / time / CO2 / congestion cost layers for a set of route nodes.
+
+    All layers are (n, n) float64 arrays computed in one broadcast pass.
+    Instances are immutable; `with_stop` / `without_stop` return a new matrix
+    that reuses the existing layers and only computes the changed row/column.
+    """
+
+    def __init__(
+        self,
+        coords: Sequence[Tuple[float, float]],
+        metric: str = "euclidean",
+        avg_speed_kmph: float = 40.0,
+        emission_factor_kg_per_km: float = 0.25,
+        congestion_base: float = 0.1,
+        seed: Optional[int] = 42,
+        _layers: Optional[tuple] = None,
+        _node_level: Optional[np.ndarray] = None,
+    ):
+        self.coords = _as_coords(coords)
+        self.metric = metric
+        self.avg_speed_kmph = avg_speed_kmph
+        self.emission_factor_kg_per_km = emission_factor_kg_per_km
+        self.congestion_base = congestion_base
+        self.seed = seed
+
+        if _layers is None:
+            n = len(self.coords)
+            dist = _pairwise_distance(self.coords, self.coords, metric)
+            np.fill_diagonal(dist, 0.0)
+            cong = _congestion(n, congestion_base, np.random.default_rng(seed))
+        else:
+            dist, cong = _layers
+        self.dist = dist                                        # km
+        self.cong = cong                                        # 0~1
+        self.time_h = dist / avg_speed_kmph                     # hr
+        self.co2 = dist * emission_factor_kg_per_km             # kg
+        # observed congestion per node (NaN = not observed); see with_node_congestion
+        self.node_level = np.full(len(self.coords), np.nan) if _node_level is None else _node_level
+        _readonly(self.coords, self.dist, self.cong, self.time_h, self.co2, self.node_level)
+
+    @property
+    def n(self) -> int:
+        return len(self.coords)
+
+    def _derive(self, coords, dist, cong, node_level=None) -> "RouteMatrix":
+        return RouteMatrix(
+            coords, self.metric, self.avg_speed_kmph, self.emission_factor_kg_per_km,
+            self.congestion_base, self.seed, _layers=(dist, cong), _node_level=node_level,
+        )
+
+    def with_stop(self, coord: Tuple[float, float]) -> "RouteMatrix":
+        """Return a new matrix with `coord` appended as node n (O(n) work)."""
+        new = _as_coords([coord])
+        coords = np.vstack([self.coords, new])
+        n = self.n
+
+        row = _pairwise_distance(new, coords, self.metric)[0]
+        row[n] = 0.0
+        dist = np.empty((n + 1, n + 1))
+        dist[:n, :n] = self.dist
+        dist[n, :] = row
+        dist[:, n] = row
+
+        cong = np.zeros((n + 1, n + 1))
+        cong[:n, :n] = self.cong
+        # draws depend only on (seed, node index), so equal calls give equal matrices
+        rng = np.random.default_rng(None if self.seed is None else [self.seed, n])
+        draws = np.clip(self.congestion_base + rng.uniform(0, 0.5, 2 * n), 0, 1.0)
+        cong[n, :n] = draws[:n]
+        cong[:n, n] = draws[n:]
+        return self._derive(coords, dist, cong, np.append(self.node_level, np.nan))
+
+    def without_stop(self, index: int) -> "RouteMatrix":
+        """Return a new matrix with node `index` removed; later nodes shift down by one."""
+        if index == 0:
+            raise ValueError("Cannot remove the depot (node 0)")
+        coords = np.delete(self.coords, index, axis=0)
+        dist = np.delete(np.delete(self.dist, index, axis=0), index, axis=1)
+        cong = np.delete(np.delete(self.cong, index, axis=0), index, axis=1)
+        return self._derive(coords, dist, cong, np.delete(self.node_level, index))
+
+    def with_node_congestion(self, levels: Dict[int, float]) -> "RouteMatrix":
+        """
+        Return a new matrix with observed congestion (0~1) at the given nodes.
+        Arcs between two observed nodes take the mean of their levels, arcs
+        touching one observed node take its level, other arcs keep the modelled
+        value. Only the rows/columns of the updated nodes are recomputed.
+        """
+        if not levels:
+            return self
+        nodes = np.fromiter(levels.keys(), dtype=np.int64)
+        node_level = self.node_level.copy()
+        node_level[nodes] = np.clip(np.fromiter(levels.values(), dtype=float), 0, 1.0)
+
+        own = node_level[nodes][:, None]
+        other = node_level[None, :]
+        arcs = np.where(np.isnan(other), own, (own + other) / 2)
+        arcs[np.arange(len(nodes)), nodes] = 0.0
+        cong = self.cong.copy()
+        cong[nodes, :] = arcs
+        cong[:, nodes] = arcs.T
+        return self._derive(self.coords, self.dist, cong, node_level)
+
+
+def _cache_key(coords: np.ndarray, metric, avg_speed_kmph, emission_factor_kg_per_km,
+               congestion_base, seed) -> tuple:
+    return (coords.shape, coords.tobytes(), metric, avg_speed_kmph,
+            emission_factor_kg_per_km, congestion_base, seed)
+
+
+def get_route_matrix(
+    coords: List[Tuple[float, float]],
+    metric: str = "euclidean",
+    avg_speed_kmph: float = 40.0,
+    emission_factor_kg_per_km: float = 0.25,
+    congestion_base: float = 0.1,
+    seed: Optional[int] = 42,
+) -> RouteMatrix:
+    """Return a cached RouteMatrix for this coordinate set, building it on first use."""
+    arr = _as_coords(coords)
+    key = _cache_key(arr, metric, avg_speed_kmph, emission_factor_kg_per_km, congestion_base, seed)
+    if key in _matrix_cache:
+        _matrix_cache.move_to_end(key)
+        return _matrix_cache[key]
+
+    matrix = RouteMatrix(arr, metric, avg_speed_kmph, emission_factor_kg_per_km, congestion_base, seed)
+    _matrix_cache[key] = matrix
+    if len(_matrix_cache) > _CACHE_SIZE:
+        _matrix_cache.popitem(last=False)
+    return matrix
+
+
+def clear_matrix_cache():
+    _matrix_cache.clear()
@@ -1,9 +1,11 @@
 # src/route_vrp.py
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
-from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+import pandas as pd
 from .kpi import KPIWeights, normalize_weights
+from .route_matrix import get_route_matrix
+from .spatial_index import SpatialIndex
 
 def _mock_nodes(n_customers=8, seed=42):
     rng = np.random.default_rng(seed)
@@ -12,27 +14,93 @@ def _mock_nodes(n_customers=8, seed=42):
     coords += [(float(rng.uniform(-10, 10)), float(rng.uniform(-10, 10))) for _ in range(n_customers)]
     return coords  # index 0 = depot
 
-def _euclid(a, b):
-    return float(np.hypot(a[0]-b[0], a[1]-b[1]))
+COST_SCALE = 1000   # solver works on integers: milli-units of the blended KPI cost
+NO_ROUTE = "No feasible route"   # route placeholder when the search finds no solution
 
-def _distance_matrix(coords):
-    n = len(coords)
-    mat = [[0.0]*n for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                mat[i][j] = _euclid(coords[i], coords[j])
-    return mat
-
-def _congestion_matrix(n: int, base: float = 0.1, seed=42):
-    rng = np.random.default_rng(seed)
+def _arc_cost_matrix(mat, w: KPIWeights) -> np.ndarray:
+    """Blend the KPI layers with normalized weights into a scaled int64 arc-cost matrix."""
+    cost = (
+        w.distance * mat.dist +
+        w.time     * mat.time_h * 10.0 +
+        w.co2      * mat.co2    * 0.1 +
+        w.congestion * mat.cong * 10.0
+    )
+    return np.rint(cost * COST_SCALE).astype(np.int64)
 
-    mat = [[0.0]*n for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                mat[i][j] = float(np.clip(base + rng.uniform(0, 0.5), 0, 1.0))
-    return mat
+def _search_parameters(time_limit_s: float = 3, solution_limit: Optional[int] = None):
+    # OR-Tools loads only when a solve actually runs; cache hits never import it
+    from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+    search = pywrapcp.DefaultRoutingSearchParameters()
+    search.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+    search.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    search.time_limit.FromMilliseconds(int(time_limit_s * 1000))
+    if solution_limit:
+        search.solution_limit = solution_limit
+    return search
+
+def _route_metrics(mat, order: List[int]) -> Dict[str, float]:
+    src, dst = np.array(order[:-1], dtype=int), np.array(order[1:], dtype=int)
+    return {
+        "distance_km": round(float(mat.dist[src, dst].sum()), 2),
+        "time_hr": round(float(mat.time_h[src, dst].sum()), 2),
+        "co2_kg": round(float(mat.co2[src, dst].sum()), 2),
+        "congestion_index": round(float(mat.cong[src, dst].sum()), 2)
+    }
+
+def _decode(routing, manager, solution, vehicle: int) -> List[int]:
+    index = routing.Start(vehicle)
+    order = [manager.IndexToNode(index)]
+    while not routing.IsEnd(index):
+        index = solution.Value(routing.NextVar(index))
+        order.append(manager.IndexToNode(index))
+    return order
+
+def _solve(routing, manager, search, labels, initial_routes, vehicle_count):
+    """Solve, warm-starting from label routes of a previous solve when given."""
+    if initial_routes:
+        node_of = {label: i for i, label in enumerate(labels)}
+        hint = [[manager.NodeToIndex(node_of[l]) for l in r if node_of.get(l, 0) != 0]
+                for r in initial_routes[:vehicle_count]]
+        hint += [[] for _ in range(vehicle_count - len(hint))]
+        routing.CloseModelWithParameters(search)
+        initial = routing.ReadAssignmentFromRoutes(hint, True)
+        if initial is not None:
+            solution = routing.SolveFromAssignmentWithParameters(initial, search)
+            if solution is not None:
+                return solution
+    return routing.SolveWithParameters(search)
+
+def _build_matrix(use_mock, coords, metric, avg_speed_kmph, emission_factor_kg_per_km):
+    if use_mock or coords is None:
+        coords = _mock_nodes(n_customers=8)
+        metric = metric or "euclidean"      # mock nodes are planar km offsets
+
+    # real coords are (lat, lon)
+    return get_route_matrix(coords, metric=metric or "haversine",
+                            avg_speed_kmph=avg_speed_kmph,
+                            emission_factor_kg_per_km=emission_factor_kg_per_km)
+
+def load_depot_nodes(depot: str, path="data/equipment_location.csv",
+                     max_sites: Optional[int] = None, radius_km: Optional[float] = None):
+    """
+    Nodes for one warehouse from equipment_location.csv: the depot first, then the sites.
+    With `max_sites` / `radius_km` only the nearest sites (within the radius) are
+    kept, picked through a spatial index instead of routing every site.
+    Returns (coords, labels) ready for optimize_fleet.
+    """
+    locs = pd.read_csv(path)
+    depot_row = locs[(locs["type"] == "Warehouse") & (locs["name"] == depot)]
+    if depot_row.empty:
+        raise KeyError(f"Warehouse {depot!r} not found in {path}")
+    sites = locs[locs["type"] == "Site"]
+    if max_sites is not None or radius_km is not None:
+        index = SpatialIndex.from_frame(sites, "name")
+        lat, lon = float(depot_row["lat"].iloc[0]), float(depot_row["lon"].iloc[0])
+        near = index.within(lat, lon, radius_km) if radius_km is not None else index.nearest(lat, lon, max_sites)
+        near = near.head(max_sites) if max_sites is not None else near
+        sites = sites.set_index("name").loc[near["id"]].reset_index()[sites.columns]
+    nodes = pd.concat([depot_row, sites])
+    return list(zip(nodes["lat"], nodes["lon"])), nodes["name"].tolist()
 
 def optimize_route(
     use_mock: bool = True,
@@ -40,70 +108,130 @@ def optimize_route(
     vehicle_count: int = 1,
     emission_factor_kg_per_km: float = 0.25, 
     avg_speed_kmph: float = 40.0,
-    weights: KPIWeights = KPIWeights(1,1,1,1)
+    weights: KPIWeights = KPIWeights(1,1,1,1),
+    metric: str = None,
+    time_limit_s: float = 3,
+    solution_limit: Optional[int] = None,
+    initial_route: List[str] = None,
+    congestion: Optional[Dict[int, float]] = None
 ):
-
+    """
+    Single-route solve. `congestion` maps node index -> observed congestion (0~1),
+    e.g. from src.cctv_stream.CongestionFeed, and overrides the modelled congestion
+    on arcs touching those nodes.
+    """
     w = normalize_weights(weights)
+    mat = _build_matrix(use_mock, coords, metric, avg_speed_kmph, emission_factor_kg_per_km)
+    mat = mat.with_node_congestion(congestion or {})
+    n = mat.n
 
-    if use_mock or coords is None:
-        coords = _mock_nodes(n_customers=8)
-
-    n = len(coords)
-    dist = _distance_matrix(coords)               # km
-    cong = _congestion_matrix(n)                  # 0~1
-    time_h = [[(dist[i][j] / avg_speed_kmph) for j in range(n)] for i in range(n)]  # hr
-    co2   = [[dist[i][j] * emission_factor_kg_per_km for j in range(n)] for i in range(n)]
-
-
+    from ortools.constraint_solver import pywrapcp
     manager = pywrapcp.RoutingIndexManager(n, vehicle_count, 0)  # depot=0
     routing = pywrapcp.RoutingModel(manager)
 
-    def cost_cb(from_index, to_index):
-        i, j = manager.IndexToNode(from_index), manager.IndexToNode(to_index)
-        cost = (
-            w.distance * dist[i][j] +
-            w.time     * time_h[i][j] * 10.0 +  
-            w.co2      * co2[i][j]    * 0.1 +  
-            w.congestion * cong[i][j] * 10.0
-        )
-        return int(round(cost * 1000))
-
-    transit_cb_index = routing.RegisterTransitCallback(cost_cb)
+    # Passing the whole matrix keeps arc evaluation inside the C++ solver
+    # instead of calling back into Python for every arc.
+    arc_cost = _arc_cost_matrix(mat, w)
+    transit_cb_index = routing.RegisterTransitMatrix(arc_cost.tolist())
     routing.SetArcCostEvaluatorOfAllVehicles(transit_cb_index)
 
 
     routing.AddDimension(transit_cb_index, 0, 10**9, True, "CostDim")
 
-    search = pywrapcp.DefaultRoutingSearchParameters()
-    search.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
-    search.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
-    search.time_limit.FromSeconds(3)
-    solution = routing.SolveWithParameters(search)
+    labels = [f"N{i}" for i in range(n)]
+    search = _search_parameters(time_limit_s, solution_limit)
+    solution = _solve(routing, manager, search, labels,
+                      [initial_route] if initial_route else None, vehicle_count)
 
     if solution is None:
-        return ["No feasible route"], {"distance_km":0,"time_hr":0,"co2_kg":0,"congestion":0}
+        return [NO_ROUTE], {"distance_km":0,"time_hr":0,"co2_kg":0,"congestion_index":0}
 
-    index = routing.Start(0)
-    order = [0]
-    total_dist, total_time, total_co2, total_cong = 0.0, 0.0, 0.0, 0.0
-    while not routing.IsEnd(index):
-        next_index = solution.Value(routing.NextVar(index))
-        i, j = manager.IndexToNode(index), manager.IndexToNode(next_index)
-        total_dist += dist[i][j]
-        total_time += time_h[i][j]
-        total_co2  += co2[i][j]
-        total_cong += cong[i][j]
-        order.append(j)
-        index = next_index
-
-    return (
-        [f"N{node}" for node in order],  
-        {
-            "distance_km": round(total_dist, 2),
-            "time_hr": round(total_time, 2),
-            "co2_kg": round(total_co2, 2),
-            "congestion_index": round(total_cong, 2)
-        }
-    )
+    order = _decode(routing, manager, solution, 0)
+    return [labels[node] for node in order], _route_metrics(mat, order)
+
+def optimize_fleet(
+    coords: List[Tuple[float, float]] = None,
+    labels: List[str] = None,
+    vehicle_count: int = 3,
+    demands: Sequence[int] = None,
+    vehicle_capacities: Sequence[int] = None,
+    time_windows: Sequence[Tuple[float, float]] = None,
+    service_time_h: float = 0.0,
+    horizon_h: float = 24.0,
+    initial_routes: List[List[str]] = None,
+    emission_factor_kg_per_km: float = 0.25,
+    avg_speed_kmph: float = 40.0,
+    weights: KPIWeights = KPIWeights(1,1,1,1),
+    metric: str = None,
+    time_limit_s: float = 3,
+    solution_limit: Optional[int] = None,
+    congestion: Optional[Dict[int, float]] = None
+):
+    """
+    Multi-vehicle VRP from a single depot (node 0).
+
+    demands / vehicle_capacities: per-node load and per-vehicle capacity (same units).
+    time_windows: per-node (earliest, latest) arrival in hours from shift start.
+    initial_routes: routes from a previous solve (labels, as returned here) used as a
+    warm start; stops that no longer exist are ignored.
+    congestion: observed congestion per node index, as in optimize_route.
+
+    Returns (routes, metrics): one label list per vehicle, and totals plus a
+    "vehicles" list with each vehicle's load and KPI metrics.
+    """
+    w = normalize_weights(weights)
+    mat = _build_matrix(coords is None, coords, metric, avg_speed_kmph, emission_factor_kg_per_km)
+    mat = mat.with_node_congestion(congestion or {})
+    n = mat.n
+    labels = labels or [f"N{i}" for i in range(n)]
 
+    from ortools.constraint_solver import pywrapcp
+    manager = pywrapcp.RoutingIndexManager(n, vehicle_count, 0)
+    routing = pywrapcp.RoutingModel(manager)
+
+    cost_idx = routing.RegisterTransitMatrix(_arc_cost_matrix(mat, w).tolist())
+    routing.SetArcCostEvaluatorOfAllVehicles(cost_idx)
+
+    if demands is not None:
+        capacities = vehicle_capacities if vehicle_capacities is not None else [sum(demands)] * vehicle_count
+        demand_idx = routing.RegisterUnaryTransitVector([int(d) for d in demands])
+        routing.AddDimensionWithVehicleCapacity(demand_idx, 0, [int(c) for c in capacities], True, "Load")
+
+    if time_windows is not None or service_time_h:
+        # minutes: travel from i to j plus service at i
+        travel_min = np.rint((mat.time_h + service_time_h) * 60).astype(np.int64)
+        np.fill_diagonal(travel_min, 0)
+        time_idx = routing.RegisterTransitMatrix(travel_min.tolist())
+        horizon = int(horizon_h * 60)
+        routing.AddDimension(time_idx, horizon, horizon, False, "Time")
+        time_dim = routing.GetDimensionOrDie("Time")
+        for node, (start, end) in enumerate(time_windows or []):
+            lo, hi = int(start * 60), int(end * 60)
+            if node == 0:
+                for v in range(vehicle_count):
+                    time_dim.CumulVar(routing.Start(v)).SetRange(lo, hi)
+            else:
+                time_dim.CumulVar(manager.NodeToIndex(node)).SetRange(lo, hi)
+
+    search = _search_parameters(time_limit_s, solution_limit)
+    solution = _solve(routing, manager, search, labels, initial_routes, vehicle_count)
 
+    if solution is None:
+        return [[NO_ROUTE]], {"distance_km":0,"time_hr":0,"co2_kg":0,"congestion_index":0,"vehicles":[]}
+
+    routes, vehicles = [], []
+    load = routing.GetDimensionOrDie("Load") if demands is not None else None
+    for v in range(vehicle_count):
+        order = _decode(routing, manager, solution, v)
+        routes.append([labels[node] for node in order])
+        vm = _route_metrics(mat, order)
+        vm["vehicle"] = v
+        vm["stops"] = len(order) - 2
+        if load is not None:
+            vm["load"] = solution.Value(load.CumulVar(routing.End(v)))
+        vehicles.append(vm)
+
+    totals = {k: round(sum(vm[k] for vm in vehicles), 2)
+              for k in ("distance_km", "time_hr", "co2_kg", "congestion_index")}
+    totals["vehicles"] = vehicles
+    return routes, totals
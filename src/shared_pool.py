@@ -1,27 +1,45 @@
 # src/shared_pool.py
+import numpy as np
 import pandas as pd
-import random
 import os
 
-def generate_shared_pool(n=20):
-    companies = ["RPM Hire", "CoHire", "BuildMate"]
-    equipment_types = ["Excavator", "Bulldozer", "Crane", "Truck", "Forklift"]
-    status_options = ["Available", "In Use", "Maintenance"]
+COMPANIES = ["RPM Hire", "CoHire", "BuildMate"]
+EQUIPMENT_TYPES = ["Excavator", "Bulldozer", "Crane", "Truck", "Forklift"]
+STATUS_OPTIONS = ["Available", "In Use", "Maintenance"]
+
+def generate_shared_pool(n=20, seed=11):
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    width = max(3, len(str(n)))
+    return pd.DataFrame({
+        "equipment_id": pd.Series(np.arange(1, n + 1)).astype(str).str.zfill(width).radd("EQT"),
+        "company": rng.choice(COMPANIES, n),
+        "equipment_type": rng.choice(EQUIPMENT_TYPES, n),
+        "status": rng.choice(STATUS_OPTIONS, n)
+    })
+
+def expand_pool_counts(counts: pd.DataFrame, status="Available") -> pd.DataFrame:
+    """
+    Turn an aggregated pool table (source, equipment, count) into one row per
+    unit in the generate_shared_pool schema (equipment_id, company, equipment_type, status).
+    """
+    n = counts["count"].to_numpy(dtype=np.int64)
+    rows = counts.loc[counts.index.repeat(n)].reset_index(drop=True)
+    width = max(3, len(str(len(rows))))
+    return pd.DataFrame({
+        "equipment_id": pd.Series(np.arange(1, len(rows) + 1)).astype(str).str.zfill(width).radd("EQT"),
+        "company": rows["source"].to_numpy(),
+        "equipment_type": rows["equipment"].to_numpy(),
+        "status": status,
+    })
 
-    rows = []
-    for i in range(n):
-        rows.append({
-            "equipment_id": f"EQT{i+1:03d}",
-            "company": random.choice(companies),
-            "equipment_type": random.choice(equipment_types),
-            "status": random.choice(status_options)
-        })
-    return pd.DataFrame(rows)
 
 def load_shared_pool(path="data/shared_pool.csv", n=20):
-    """Load from CSV if available, else generate mock data"""
+    """Load from CSV if available, else generate mock data. Aggregated count files are expanded per unit."""
     if os.path.exists(path):
-        return pd.read_csv(path)
+        df = pd.read_csv(path)
+        if {"source", "equipment", "count"} <= set(df.columns):
+            return expand_pool_counts(df)
+        return df
     else:
         return generate_shared_pool(n)
 
@@ -0,0 +1,246 @@
+# src/spatial_index.py
+import math
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_pipeline import iter_gps_chunks, table_columns
+from src.route_matrix import EARTH_RADIUS_KM
+
+KM_PER_DEG = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance (km) from one point to many."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    h = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+class SpatialIndex:
+    """
+    Grid index of point positions (equipment pings, warehouses, sites) on the sphere.
+
+    Latitude is cut into bands `cell_km` tall; each band is cut into as many
+    longitude cells as fit `cell_km` wide at its latitude, so cells stay roughly
+    square. A radius query only opens the cells overlapping the circle's
+    lat/lon bounding box and checks their points with the exact haversine
+    distance; k-nearest widens the radius until k points are inside it.
+    Positions are kept in growable arrays addressed by id, so moving one asset
+    touches only the two cells involved.
+    """
+
+    def __init__(self, cell_km: float = 25.0, capacity: int = 1024):
+        self.cell_km = cell_km
+        self._dlat = cell_km / KM_PER_DEG
+        self._rows = max(1, math.ceil(180 / self._dlat))
+        band_lat = np.minimum(np.abs(-90 + (np.arange(self._rows) + 0.5) * self._dlat), 90)
+        self._cols = np.maximum(1, np.floor(360 * np.cos(np.radians(band_lat)) / self._dlat)).astype(np.int64)
+        self._slot: Dict[object, int] = {}
+        self._ids = np.empty(capacity, dtype=object)
+        self._lat = np.zeros(capacity)
+        self._lon = np.zeros(capacity)
+        self._cell = np.full(capacity, -1, dtype=np.int64)
+        self._free: list = []
+        self._buckets: Dict[int, Set[int]] = {}
+
+    def __len__(self):
+        return len(self._slot)
+
+    def __contains__(self, point_id):
+        return point_id in self._slot
+
+    # --- internals ---
+    def _grow(self, needed: int):
+        cap = len(self._ids)
+        if needed <= cap:
+            return
+        new_cap = max(needed, cap * 2)
+        for name in ("_ids", "_lat", "_lon", "_cell"):
+            old = getattr(self, name)
+            arr = np.empty(new_cap, dtype=object) if old.dtype == object else np.full(new_cap, -1, dtype=old.dtype)
+            arr[:cap] = old
+            setattr(self, name, arr)
+
+    def _row_of(self, lat):
+        return np.clip(((np.asarray(lat) + 90) // self._dlat).astype(np.int64), 0, self._rows - 1)
+
+    def _cells_of(self, lat, lon) -> np.ndarray:
+        row = self._row_of(lat)
+        ncol = self._cols[row]
+        col = (((np.asarray(lon) + 180) % 360) / 360 * ncol).astype(np.int64) % ncol
+        return row * (1 << 32) + col
+
+    def _slots_for(self, ids) -> np.ndarray:
+        out = np.empty(len(ids), dtype=np.int64)
+        for i, pid in enumerate(ids):
+            slot = self._slot.get(pid)
+            if slot is None:
+                slot = self._free.pop() if self._free else len(self._slot)
+                self._grow(slot + 1)
+                self._slot[pid] = slot
+                self._ids[slot] = pid
+            out[i] = slot
+        return out
+
+    # --- building / updates ---
+    def build(self, ids: Iterable, lat, lon) -> "SpatialIndex":
+        """Replace the whole index with these positions (last one wins for repeated ids)."""
+        self._slot.clear()
+        self._free.clear()
+        self._buckets.clear()
+        self._cell[:] = -1
+        self.update(ids, lat, lon)
+        return self
+
+    def update(self, ids: Iterable, lat, lon) -> int:
+        """Insert new ids and move existing ones; returns the number of positions applied."""
+        ids = list(ids)
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        if not ids:
+            return 0
+        slots = self._slots_for(ids)
+        # keep the last position of an id repeated in this batch
+        _, keep = np.unique(slots[::-1], return_index=True)
+        keep = len(slots) - 1 - keep
+        slots, lat, lon = slots[keep], lat[keep], lon[keep]
+
+        new_cell = self._cells_of(lat, lon)
+        old_cell = self._cell[slots]
+        moved = new_cell != old_cell
+        for slot, cell in zip(slots[moved & (old_cell >= 0)], old_cell[moved & (old_cell >= 0)]):
+            bucket = self._buckets[cell]
+            bucket.discard(slot)
+            if not bucket:
+                del self._buckets[cell]
+        order = np.argsort(new_cell[moved], kind="stable")
+        m_slots, m_cells = slots[moved][order], new_cell[moved][order]
+        bounds = np.flatnonzero(np.r_[True, m_cells[1:] != m_cells[:-1]]) if len(m_cells) else []
+        for start, stop in zip(bounds, list(bounds[1:]) + [len(m_cells)]):
+            self._buckets.setdefault(int(m_cells[start]), set()).update(m_slots[start:stop].tolist())
+
+        self._lat[slots], self._lon[slots], self._cell[slots] = lat, lon, new_cell
+        return len(ids)
+
+    def remove(self, ids: Iterable) -> int:
+        removed = 0
+        for pid in ids:
+            slot = self._slot.pop(pid, None)
+            if slot is None:
+                continue
+            bucket = self._buckets[self._cell[slot]]
+            bucket.discard(slot)
+            if not bucket:
+                del self._buckets[self._cell[slot]]
+            self._cell[slot] = -1
+            self._ids[slot] = None
+            self._free.append(slot)
+            removed += 1
+        return removed
+
+    def position(self, point_id) -> Tuple[float, float]:
+        slot = self._slot[point_id]
+        return float(self._lat[slot]), float(self._lon[slot])
+
+    # --- queries ---
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        dlat = radius_km / KM_PER_DEG
+        lo, hi = lat - dlat, lat + dlat
+        if lo <= -90 or hi >= 90:
+            rows, dlon = range(self._row_of(max(lo, -90)), self._row_of(min(hi, 90)) + 1), 180.0
+        else:
+            rows = range(self._row_of(lo), self._row_of(hi) + 1)
+            s = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))
+            dlon = 180.0 if s >= 1 else math.degrees(math.asin(s))
+        slots = []
+        for row in rows:
+            ncol = int(self._cols[row])
+            if dlon >= 180:
+                cols = range(ncol)
+            else:
+                first = math.floor(((lon - dlon + 180) % 360) / 360 * ncol)
+                span = math.ceil(2 * dlon / 360 * ncol) + 1
+                cols = range(ncol) if span >= ncol else ((first + i) % ncol for i in range(span))
+            for col in cols:
+                bucket = self._buckets.get(row * (1 << 32) + col)
+                if bucket:
+                    slots.extend(bucket)
+        return np.fromiter(slots, dtype=np.int64, count=len(slots))
+
+    def _allowed(self, slots: np.ndarray, allowed: Optional[Iterable]) -> np.ndarray:
+        if allowed is None:
+            return slots
+        keep = np.isin(slots, self._slots_of(allowed))
+        return slots[keep]
+
+    def _slots_of(self, ids: Iterable) -> np.ndarray:
+        return np.fromiter((self._slot[i] for i in ids if i in self._slot), dtype=np.int64)
+
+    def _result(self, slots: np.ndarray, dist: np.ndarray) -> pd.DataFrame:
+        order = np.argsort(dist, kind="stable")
+        return pd.DataFrame({"id": self._ids[slots[order]], "distance_km": dist[order]})
+
+    def within(self, lat: float, lon: float, radius_km: float, allowed: Optional[Iterable] = None) -> pd.DataFrame:
+        """Points within `radius_km` of (lat, lon), nearest first. `allowed` restricts to those ids."""
+        slots = self._allowed(self._candidates(lat, lon, radius_km), allowed)
+        dist = haversine_km(lat, lon, self._lat[slots], self._lon[slots])
+        hit = dist <= radius_km
+        return self._result(slots[hit], dist[hit])
+
+    def nearest_ids(self, lat: float, lon: float, k: int = 1,
+                    allowed: Optional[Iterable] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, distance_km) arrays of the `k` points closest to (lat, lon), nearest first."""
+        allowed_slots = None if allowed is None else self._slots_of(allowed)
+        total = len(self) if allowed_slots is None else len(allowed_slots)
+        k = min(k, total)
+        radius = self.cell_km
+        while k:
+            if radius >= math.pi * EARTH_RADIUS_KM:
+                slots = np.flatnonzero(self._cell >= 0) if allowed_slots is None else allowed_slots
+            else:
+                slots = self._candidates(lat, lon, radius)
+                if allowed_slots is not None:
+                    slots = slots[np.isin(slots, allowed_slots)]
+            dist = haversine_km(lat, lon, self._lat[slots], self._lon[slots])
+            inside = dist <= radius
+            if inside.sum() >= k or radius >= math.pi * EARTH_RADIUS_KM:
+                slots, dist = slots[inside], dist[inside]
+                order = np.argsort(dist, kind="stable")[:k]
+                return self._ids[slots[order]], dist[order]
+            radius *= 2
+        return np.empty(0, dtype=object), np.zeros(0)
+
+    def nearest(self, lat: float, lon: float, k: int = 1, allowed: Optional[Iterable] = None) -> pd.DataFrame:
+        """The `k` points closest to (lat, lon), nearest first. `allowed` restricts to those ids."""
+        ids, dist = self.nearest_ids(lat, lon, k, allowed)
+        return pd.DataFrame({"id": ids, "distance_km": dist})
+
+    # --- constructors ---
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, id_col: str, cell_km: float = 25.0) -> "SpatialIndex":
+        return cls(cell_km, capacity=max(len(df), 1)).build(df[id_col], df["lat"], df["lon"])
+
+    @classmethod
+    def from_gps(cls, gps_path="data/gps_data.csv", cell_km: float = 25.0, chunksize=None, filters=None):
+        """Latest position of every asset in a GPS file or dataset (pings assumed in time order)."""
+        index = cls(cell_km)
+        columns = ["equipment_id", "lat", "lon"]
+        has_ts = "timestamp" in table_columns(gps_path)
+        extra = {"chunksize": chunksize} if chunksize else {}
+        for chunk in iter_gps_chunks(gps_path, columns=columns + (["timestamp"] if has_ts else []),
+                                     filters=filters, **extra):
+            if has_ts:
+                chunk = chunk.sort_values("timestamp", kind="stable")
+            index.update(chunk["equipment_id"].tolist(), chunk["lat"], chunk["lon"])
+        return index
+
+
+def location_index(path="data/equipment_location.csv", kind: Optional[str] = None, cell_km: float = 25.0):
+    """Index of warehouses and/or sites by name (`kind` = "Warehouse" or "Site" to restrict)."""
+    locs = pd.read_csv(path)
+    if kind is not None:
+        locs = locs[locs["type"] == kind]
+    return SpatialIndex.from_frame(locs, "name", cell_km)
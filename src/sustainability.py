@@ -1,15 +1,45 @@
-import pandas as pd
+from src.data_pipeline import iter_gps_chunks, reduce_chunks
+
+
+class FleetFuelReducer:
+    """
+    Highest odometer reading and mean fuel rate over a stream of GPS chunks.
+    (The max rather than the last row, so partitioned datasets read in any order agree.)
+    """
+
+    def __init__(self):
+        self.max_mileage = None
+        self.fuel_sum = 0.0
+        self.fuel_count = 0
+
+    def update(self, chunk):
+        if len(chunk):
+            top = chunk["mileage_km"].max()
+            self.max_mileage = top if self.max_mileage is None else max(self.max_mileage, top)
+            fuel = chunk["fuel_l_per_100km"].astype("float64")
+            self.fuel_sum += float(fuel.sum())
+            self.fuel_count += int(fuel.count())
+        return self
+
+    def result(self):
+        mean_fuel = self.fuel_sum / self.fuel_count if self.fuel_count else float("nan")
+        return self.max_mileage, mean_fuel
+
 
 def calculate_sustainability(
     gps_path="data/gps_data.csv", 
     usage_time=120, 
     idle_time=30, 
     emission_factor=2.31, 
-    fuel_cost_per_L=1.8
+    fuel_cost_per_L=1.8,
+    chunksize=None,
+    filters=None
 ):
-    df = pd.read_csv(gps_path)
-    distance = int(df["mileage_km"].iloc[-1])
-    fuel_used = (distance / 100) * df["fuel_L_per_100km"].mean()
+    kwargs = {"chunksize": chunksize} if chunksize else {}
+    chunks = iter_gps_chunks(gps_path, columns=["mileage_km", "fuel_l_per_100km"], filters=filters, **kwargs)
+    max_mileage, mean_fuel = reduce_chunks(chunks, FleetFuelReducer())
+    distance = int(max_mileage)
+    fuel_used = (distance / 100) * mean_fuel
     carbon_emission = fuel_used * emission_factor
     utilization = usage_time / (usage_time + idle_time)
     cost = fuel_used * fuel_cost_per_L
@@ -0,0 +1,53 @@
+# tests/test_lifecycle_store.py
+import numpy as np
+import pandas as pd
+
+from src.lifecycle import HealthCoefficients
+from src.lifecycle_store import LifecycleStore
+
+
+def _fleet():
+    return pd.DataFrame({
+        "equipment_id": [1, "EQT002", "EQT003"],
+        "usage_hours": [100.0, 2000.0, 3500.0],
+        "move_count": [5, 40, 110],
+        "mileage_km": [300.0, 8000.0, 19000.0],
+    })
+
+
+def test_save_load_round_trip(tmp_path):
+    store = LifecycleStore.from_frame(_fleet(), HealthCoefficients(rul_horizon_days=400))
+    store.ingest_usage(pd.DataFrame({"equipment_id": ["EQT001"], "usage_hours": [50.0], "move_count": [2]}))
+    path = str(tmp_path / "snap")               # no suffix: save adds .npz, load must find it
+    store.save(path)
+
+    restored = LifecycleStore.load(path)
+    assert restored.version == store.version
+    assert restored.coeffs == store.coeffs
+    assert isinstance(restored.coeffs.rul_horizon_days, int)
+    pd.testing.assert_frame_equal(restored.fleet_health(), store.fleet_health())
+    assert LifecycleStore.load(path + ".npz").version == store.version
+
+
+def test_ids_are_canonical():
+    store = LifecycleStore.from_frame(_fleet().assign(equipment_id=[1, "EQT001", 2]))
+    assert len(store) == 2
+    assert store.get("EQT002")["equipment_id"] == 2
+
+
+def test_changed_rows_only():
+    store = LifecycleStore.from_frame(_fleet())
+    base = store.fleet_health().copy()
+    v = store.version
+    store.ingest_gps(pd.DataFrame({"equipment_id": ["EQT003", 4], "mileage_km": [19500.0, 10.0]}))
+
+    assert sorted(store.changed_since(v)["equipment_id"]) == [3, 4]
+    assert store.changed_since(store.version).empty
+    health = store.fleet_health()
+    assert len(health) == 4
+    pd.testing.assert_frame_equal(health.iloc[:2], base.iloc[:2])
+    assert health.loc[2, "mileage_km"] == 19500.0
+    expected = LifecycleStore.from_frame(pd.concat([_fleet(), pd.DataFrame(
+        {"equipment_id": [4], "usage_hours": [0.0], "move_count": [0], "mileage_km": [10.0]})]))
+    expected.ingest_gps(pd.DataFrame({"equipment_id": [3], "mileage_km": [19500.0]}))
+    np.testing.assert_allclose(health["health_score"], expected.fleet_health()["health_score"])
@@ -0,0 +1,27 @@
+# tests/test_rental_aggregates.py
+import numpy as np
+import pandas as pd
+
+from src.rental_aggregates import RentalAggregateStore, _DailyRollup
+
+
+def test_blank_key_is_not_booked_under_another_group():
+    r = _DailyRollup()
+    r.add(pd.Series(["North", "South", None]), np.array([0, 0, 0]), np.array([1, 1, 100]))
+    assert set(r.keys) == {"North", "South"}
+    assert r.days[r.keys["South"], 0] == 1
+    assert r.days.sum() == 2
+
+
+def test_blank_region_left_out_of_trend_only():
+    store = RentalAggregateStore()
+    store.append(pd.DataFrame({
+        "start_date": ["2025-01-01", "2025-01-01", "2025-01-02"],
+        "equipment": ["Crane", "Truck", "Crane"],
+        "project": ["Highway", "Bridge", "Metro"],
+        "region": ["VIC", np.nan, "NSW"],
+        "rental_days": [3, 50, 4],
+    }))
+    trend = store.region_trend().set_index("region")["total_days"].to_dict()
+    assert trend == {"NSW": 4, "VIC": 3}
+    assert store.forecast_demand()["demand_forecast_days"].sum() == 57